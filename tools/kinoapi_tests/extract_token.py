@@ -1,15 +1,20 @@
 import argparse
 import datetime as _dt
+import functools
+import http.client
 import json
+import math
 import os
+import socket
 import sys
+import threading
 import time
-import urllib.error
 import urllib.parse
-import urllib.request
 import webbrowser
 from dataclasses import dataclass
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from proxy_support import KeepAliveClient
 
 
 """
@@ -22,6 +27,8 @@ This script is intended as:
 
 Security notes:
 - The generated token file is under `.local/` (ignored by `.gitignore`). Do NOT commit/share it.
+- While authorization is pending, the device code is kept in `.local/device_state.json` so an
+  interrupted run can resume polling it; the file is removed once the flow finishes.
 """
 
 
@@ -29,6 +36,8 @@ BASE_URL_DEFAULT = "https://api.service-kp.com/"
 ENV_CLIENT_ID = "KINOPUB_CLIENT_ID"
 ENV_CLIENT_SECRET = "KINOPUB_CLIENT_SECRET"
 
+_NS_PER_S = 1_000_000_000
+
 
 def _script_dir() -> str:
     return os.path.dirname(os.path.abspath(__file__))
@@ -45,45 +54,103 @@ def _ensure_trailing_slash(url: str) -> str:
 @dataclass
 class HttpResponse:
     status: int
-    headers: Dict[str, str]
-    raw_text: str
+    headers: Mapping[str, str]  # case-insensitive http.client.HTTPMessage
+    raw: bytes
     json: Optional[Any]
 
+    @functools.cached_property
+    def raw_text(self) -> str:
+        # Only needed for error messages; decode on first use.
+        return self.raw.decode("utf-8", errors="replace")
+
+
+def _is_json_content_type(headers: Mapping[str, str]) -> bool:
+    # Compare the media type only (drop parameters like "; charset=utf-8").
+    ct = (headers.get("Content-Type") or "").split(";", 1)[0].strip().lower()
+    return ct == "application/json" or ct.endswith("+json") or ct == "application/javascript"
+
+
+class _HttpClient(KeepAliveClient):
+    """
+    Keep-alive HTTP client for the device flow, with the host's addresses resolved once per client.
+
+    The device flow polls the same host every few seconds; reusing the connection saves a
+    TCP + TLS handshake per poll compared to a fresh `urlopen` call.
+    """
 
-def _is_json_content_type(headers: Dict[str, str]) -> bool:
-    ct = headers.get("Content-Type", "")
-    return "application/json" in ct or "application/js" in ct or "+json" in ct
+    def __init__(self, timeout_s: int = 30) -> None:
+        super().__init__(timeout_s)
+        self._addrs: Dict[Tuple[str, int], List[Tuple[str, int]]] = {}
 
+    def _resolve(self, host: str, port: int) -> List[Tuple[str, int]]:
+        # Resolve once per client: reconnects (e.g. after an idle drop) then skip the DNS lookup.
+        key = (host, port)
+        addrs = self._addrs.get(key)
+        if addrs is None:
+            infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+            addrs = [(info[4][0], info[4][1]) for info in infos]
+            self._addrs[key] = addrs
+        return addrs
 
-def _http_post_query(base_url: str, path: str, query: Dict[str, Any], timeout_s: int = 30) -> HttpResponse:
+    def _create_connection(self, address: Tuple[str, int], timeout: Any = None, source_address: Any = None) -> socket.socket:
+        err: Optional[OSError] = None
+        for addr in self._resolve(*address):
+            try:
+                return socket.create_connection(addr, timeout, source_address)
+            except OSError as e:
+                err = e
+        # Every cached address failed: forget them so the next attempt resolves again.
+        self._addrs.pop(address, None)
+        raise err if err is not None else OSError(f"could not resolve {address[0]}")
+
+    def _new_connection(self, key: Tuple[str, str, int], timeout_s: float) -> http.client.HTTPConnection:
+        conn = super()._new_connection(key, timeout_s)
+        if self._route(key) is None:
+            # TLS still verifies/sends SNI for `host`; only the TCP connect uses the cached address.
+            conn._create_connection = self._create_connection  # type: ignore[attr-defined]
+        return conn
+
+
+# Same request headers urllib used to send, so the API sees an identical client.
+_POST_HEADERS = {
+    "Accept": "application/json",
+    "Content-Type": "application/x-www-form-urlencoded",
+    "User-Agent": f"Python-urllib/{sys.version_info[0]}.{sys.version_info[1]}",
+}
+
+
+def _build_url(base_url: str, path: str, query: Dict[str, Any]) -> str:
     base_url = _ensure_trailing_slash(base_url)
     url = base_url.rstrip("/") + "/" + path.lstrip("/")
     if query:
         url += "?" + urllib.parse.urlencode(query, doseq=True)
+    return url
 
-    req = urllib.request.Request(url, method="POST", headers={"Accept": "application/json"})
 
-    try:
-        with urllib.request.urlopen(req, data=b"", timeout=timeout_s) as resp:
-            raw = resp.read()
-            status = resp.status
-            resp_headers = {k: v for k, v in resp.headers.items()}
-    except urllib.error.HTTPError as e:
-        raw = e.read()
-        status = e.code
-        resp_headers = {k: v for k, v in e.headers.items()}
-
-    raw_text = raw.decode("utf-8", errors="replace")
+def _http_post_query(
+    client: _HttpClient,
+    base_url: str,
+    path: str,
+    query: Dict[str, Any],
+    timeout_s: int = 30,
+) -> HttpResponse:
+    return _http_post_url(client, _build_url(base_url, path, query), timeout_s=timeout_s)
+
+
+def _http_post_url(client: _HttpClient, url: str, timeout_s: int = 30) -> HttpResponse:
+    status, resp_headers, raw = client.request("POST", url, headers=_POST_HEADERS, body=b"", timeout_s=timeout_s)
+
     parsed_json: Optional[Any] = None
-    if raw_text:
-        is_jsonish = _is_json_content_type(resp_headers) or raw_text.lstrip().startswith(("{", "["))
+    if raw:
+        is_jsonish = _is_json_content_type(resp_headers) or raw.lstrip().startswith((b"{", b"["))
         if is_jsonish:
             try:
-                parsed_json = json.loads(raw_text)
+                # json.loads accepts bytes directly; no intermediate str copy.
+                parsed_json = json.loads(raw)
             except Exception:
                 parsed_json = None
 
-    return HttpResponse(status=status, headers=resp_headers, raw_text=raw_text, json=parsed_json)
+    return HttpResponse(status=status, headers=resp_headers, raw=raw, json=parsed_json)
 
 
 def _safe_mkdir(path: str) -> None:
@@ -91,9 +158,35 @@ def _safe_mkdir(path: str) -> None:
 
 
 def _write_json(path: str, obj: Any) -> None:
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(json.dumps(obj, ensure_ascii=False, indent=2, sort_keys=True))
-        f.write("\n")
+    """
+    Atomically write `obj` as JSON with owner-only permissions (the token file is a secret).
+    Writes to a temp file first, so a crash never leaves a truncated token file behind.
+    """
+    data = (json.dumps(obj, ensure_ascii=False, indent=2, sort_keys=True) + "\n").encode("utf-8")
+    tmp = path + ".tmp"
+    # The mode only applies to a newly created file: drop any leftover temp file (e.g. from a crash)
+    # and create a fresh one exclusively, so its (possibly wider) permissions are never inherited.
+    try:
+        os.unlink(tmp)
+    except FileNotFoundError:
+        pass
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o600)
+    try:
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp, path)
+    except BaseException:
+        # Don't leave a partial secret behind.
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
 
 
 def _now_iso() -> str:
@@ -101,86 +194,272 @@ def _now_iso() -> str:
 
 
 def _mask(s: str, keep: int = 6) -> str:
-    s = s or ""
-    if len(s) <= keep:
-        return "<redacted>"
-    return s[:keep] + "…" + f"(len={len(s)})"
-
-
-def _print_remaining(deadline: float) -> None:
-    remaining_s = max(0, int(deadline - time.time()))
+    n = len(s) if s else 0
+    return "<redacted>" if n <= keep else f"{s[:keep]}…(len={n})"
+
+
+def _print_remaining(deadline_ns: int, last_printed_s: int = -1) -> int:
+    """
+    Redraw the status line; `deadline_ns` is a time.monotonic_ns() timestamp.
+    Returns the number of seconds shown, so callers can pass it back and skip redundant redraws.
+    """
+    remaining_s = max(0, (deadline_ns - time.monotonic_ns()) // _NS_PER_S)
+    if remaining_s == last_printed_s:
+        return remaining_s
     mm, ss = divmod(remaining_s, 60)
     # Single-line status that overwrites itself.
     # Minutes are fixed-width to avoid leftover characters when going from 100+ -> 2 digits.
     sys.stdout.write(f"\rWaiting for authorization... remaining {mm:4d}:{ss:02d}")
     sys.stdout.flush()
+    return remaining_s
 
 
-def _device_flow(
+@dataclass
+class DeviceCode:
+    code: str
+    user_code: str
+    verification_uri: str
+    expires_in: int
+    interval: int
+
+
+# (field, expected type, error suffix) for the step-1 response, validated in one pass.
+_DEVICE_CODE_FIELDS = (
+    ("code", str, "missing 'code'"),
+    ("user_code", str, "missing 'user_code'"),
+    ("verification_uri", str, "missing 'verification_uri'"),
+    ("expires_in", int, "missing/invalid 'expires_in'"),
+    ("interval", int, "missing/invalid 'interval'"),
+)
+
+
+def _parse_device_code(obj: Dict[str, Any]) -> DeviceCode:
+    values = {name: obj.get(name) for name, _, _ in _DEVICE_CODE_FIELDS}
+    if not values["verification_uri"]:
+        values["verification_uri"] = obj.get("verification_uri_complete")
+    for name, typ, err in _DEVICE_CODE_FIELDS:
+        v = values[name]
+        if not isinstance(v, typ) or (typ is str and not v):
+            raise RuntimeError(f"device_code: {err}")
+    return DeviceCode(**values)
+
+
+def _default_device_state_file(token_file: str) -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(token_file)), "device_state.json")
+
+
+def _load_device_state(path: str, base_url: str, client_id: str) -> Optional[DeviceCode]:
+    """
+    Return the pending device code saved by an earlier run, if it belongs to the same
+    base_url/client_id and has not (nearly) expired. Uses wall-clock time: it spans processes.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            obj = json.loads(f.read())
+    except Exception:
+        return None
+    if not isinstance(obj, dict) or obj.get("base_url") != base_url or obj.get("client_id") != client_id:
+        return None
+    expires_at = obj.get("expires_at")
+    if not isinstance(expires_at, (int, float)) or expires_at <= time.time() + 5:
+        return None
+    try:
+        return _parse_device_code(dict(obj, expires_in=int(expires_at - time.time())))
+    except RuntimeError:
+        return None
+
+
+def _save_device_state(path: str, base_url: str, client_id: str, dc: DeviceCode) -> None:
+    _safe_mkdir(os.path.dirname(os.path.abspath(path)))
+    _write_json(
+        path,
+        {
+            "base_url": base_url,
+            "client_id": client_id,
+            "code": dc.code,
+            "user_code": dc.user_code,
+            "verification_uri": dc.verification_uri,
+            "expires_at": time.time() + dc.expires_in,
+            "interval": dc.interval,
+        },
+    )
+
+
+def _remove_device_state(path: Optional[str]) -> None:
+    if not path:
+        return
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _load_cached_token(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Read a token file previously written by this script.
+    Returns None if it is missing, unreadable, or has no access_token.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            obj = json.loads(f.read())
+    except Exception:
+        return None
+    if not isinstance(obj, dict) or not isinstance(obj.get("access_token"), str) or not obj["access_token"]:
+        return None
+    return obj
+
+
+def _is_token_fresh(token_obj: Dict[str, Any], skew_s: int = 60) -> bool:
+    obtained_at = token_obj.get("obtained_at")
+    expires_in = token_obj.get("expires_in")
+    if not isinstance(obtained_at, str) or not isinstance(expires_in, int) or isinstance(expires_in, bool):
+        return False
+    try:
+        obtained = _dt.datetime.fromisoformat(obtained_at)
+    except ValueError:
+        return False
+    if obtained.tzinfo is None:
+        return False
+    expires_at = obtained + _dt.timedelta(seconds=expires_in - skew_s)
+    return expires_at > _dt.datetime.now(_dt.timezone.utc)
+
+
+def _refresh_access_token(
+    client: _HttpClient,
     base_url: str,
     client_id: str,
     client_secret: str,
+    refresh_token: str,
     *,
-    open_browser: bool,
     timeout_s: int,
 ) -> Dict[str, Any]:
-    # Step 1: request device_code
-    r_code = _http_post_query(
+    # Step 3 of the flow in `api/v1/authentication.md`.
+    r = _http_post_query(
+        client,
         base_url,
         "/oauth2/device",
-        query={"grant_type": "device_code", "client_id": client_id, "client_secret": client_secret},
+        query={
+            "grant_type": "refresh_token",
+            "client_id": client_id,
+            "client_secret": client_secret,
+            "refresh_token": refresh_token,
+        },
         timeout_s=timeout_s,
     )
-    if not isinstance(r_code.json, dict):
-        raise RuntimeError(f"device_code: expected JSON object, got HTTP {r_code.status}: {r_code.raw_text[:200]}")
-
-    code = r_code.json.get("code")
-    user_code = r_code.json.get("user_code")
-    verification_uri = r_code.json.get("verification_uri") or r_code.json.get("verification_uri_complete")
-    expires_in = r_code.json.get("expires_in")
-    interval = r_code.json.get("interval")
-
-    if not isinstance(code, str) or not code:
-        raise RuntimeError("device_code: missing 'code'")
-    if not isinstance(user_code, str) or not user_code:
-        raise RuntimeError("device_code: missing 'user_code'")
-    if not isinstance(verification_uri, str) or not verification_uri:
-        raise RuntimeError("device_code: missing 'verification_uri'")
-    if not isinstance(expires_in, int):
-        raise RuntimeError("device_code: missing/invalid 'expires_in'")
-    if not isinstance(interval, int):
-        raise RuntimeError("device_code: missing/invalid 'interval'")
+    if not isinstance(r.json, dict) or not isinstance(r.json.get("access_token"), str):
+        raise RuntimeError(f"refresh_token: unexpected response HTTP {r.status}: {r.raw_text[:200]}")
+    return r.json
+
+
+def _open_browser(url: str) -> None:
+    try:
+        webbrowser.open(url)
+    except Exception:
+        pass
+
+
+def _device_flow(
+    client: _HttpClient,
+    base_url: str,
+    client_id: str,
+    client_secret: str,
+    *,
+    open_browser: bool,
+    timeout_s: int,
+    state_file: Optional[str] = None,
+) -> Dict[str, Any]:
+    # A previous run may have been interrupted while the user was still authorizing:
+    # keep polling its device code instead of asking the user to enter a new one.
+    dc = _load_device_state(state_file, base_url, client_id) if state_file else None
+    resumed = dc is not None
+
+    if dc is None:
+        # Step 1: request device_code
+        r_code = _http_post_query(
+            client,
+            base_url,
+            "/oauth2/device",
+            query={"grant_type": "device_code", "client_id": client_id, "client_secret": client_secret},
+            timeout_s=timeout_s,
+        )
+        if not isinstance(r_code.json, dict):
+            raise RuntimeError(f"device_code: expected JSON object, got HTTP {r_code.status}: {r_code.raw_text[:200]}")
+        dc = _parse_device_code(r_code.json)
+        if state_file:
+            _save_device_state(state_file, base_url, client_id, dc)
 
     print("")
-    print("OAuth2 Device Flow")
+    print("OAuth2 Device Flow" + (" (resuming the previous run's code)" if resumed else ""))
     print("")
     print("1) Open this URL in a browser:")
-    print(f"   {verification_uri}")
+    print(f"   {dc.verification_uri}")
     print("2) Enter this code:")
-    print(f"   {user_code}")
+    print(f"   {dc.user_code}")
     print("")
-    print(f"Device code expires in ~{expires_in}s. Poll interval: {interval}s.")
+    print(f"Device code expires in ~{dc.expires_in}s. Poll interval: {dc.interval}s.")
     print("")
 
     if open_browser:
-        try:
-            webbrowser.open(verification_uri)
-        except Exception:
-            pass
+        # Launching a browser can block for a while (fork/exec); don't delay the first poll on it.
+        threading.Thread(target=_open_browser, args=(dc.verification_uri,), daemon=True).start()
 
+    try:
+        token_payload = _poll_device_token(
+            client,
+            base_url,
+            client_id,
+            client_secret,
+            dc,
+            timeout_s=timeout_s,
+            # The previous process may have polled just before exiting; don't trip slow_down.
+            wait_first=resumed,
+        )
+    except RuntimeError:
+        # Terminal outcome (expired/denied/timeout/unexpected): the saved code is of no further use.
+        _remove_device_state(state_file)
+        raise
+    _remove_device_state(state_file)
+    return token_payload
+
+
+def _poll_device_token(
+    client: _HttpClient,
+    base_url: str,
+    client_id: str,
+    client_secret: str,
+    dc: DeviceCode,
+    *,
+    timeout_s: int,
+    wait_first: bool = False,
+) -> Dict[str, Any]:
     # Step 2: poll for access token
-    deadline = time.time() + max(1, expires_in)
-    poll_interval = max(1, interval)
+    # Monotonic clock: immune to wall-clock jumps during a long device-code lifetime.
+    deadline_ns = time.monotonic_ns() + max(1, dc.expires_in) * _NS_PER_S
+    # Poll slightly slower than the server minimum so clock skew doesn't trigger slow_down.
+    poll_interval = math.ceil(max(1, dc.interval) * 1.2)
+    slow_down_count = 0
+    last_poll_ns: Optional[int] = None
+    last_printed_s = -1
     attempt = 0
 
-    while time.time() < deadline:
+    # The poll request never changes, so build its URL once instead of on every iteration.
+    poll_url = _build_url(
+        base_url,
+        "/oauth2/device",
+        {"grant_type": "device_token", "client_id": client_id, "client_secret": client_secret, "code": dc.code},
+    )
+
+    if wait_first:
+        time.sleep(poll_interval)
+
+    while time.monotonic_ns() < deadline_ns:
         attempt += 1
-        r_poll = _http_post_query(
-            base_url,
-            "/oauth2/device",
-            query={"grant_type": "device_token", "client_id": client_id, "client_secret": client_secret, "code": code},
-            timeout_s=timeout_s,
-        )
+        poll_started_ns = time.monotonic_ns()
+        poll_gap_ns = (poll_started_ns - last_poll_ns) if last_poll_ns is not None else None
+        last_poll_ns = poll_started_ns
+        # A stalled poll must not outlive the device code: cap the HTTP timeout at the time left.
+        remaining_s = -(-(deadline_ns - poll_started_ns) // _NS_PER_S)  # ceil division
+        r_poll = _http_post_url(client, poll_url, timeout_s=max(1, min(timeout_s, remaining_s)))
 
         if isinstance(r_poll.json, dict) and isinstance(r_poll.json.get("access_token"), str):
             # Finish the status line cleanly.
@@ -192,10 +471,24 @@ def _device_flow(
             err = r_poll.json.get("error")
             if err == "authorization_pending":
                 # User hasn't finished authorizing yet.
-                _print_remaining(deadline)
+                last_printed_s = _print_remaining(deadline_ns, last_printed_s)
             elif err == "slow_down":
-                poll_interval += 5
-                _print_remaining(deadline)
+                slow_down_count += 1
+                if slow_down_count >= 2:
+                    # We already poll with a safety margin; repeated slow_down means our clock runs fast.
+                    sys.stdout.write("\n")
+                    gap = f"{poll_gap_ns / _NS_PER_S:.2f}s" if poll_gap_ns is not None else "n/a"
+                    raise RuntimeError(
+                        f"device_token: persistent slow_down; clock drift suspected "
+                        f"(measured poll gap {gap}, requested interval {poll_interval}s)"
+                    )
+                # Follow the interval the server asks for (if any), padded by 40%.
+                new_interval = r_poll.json.get("interval")
+                if isinstance(new_interval, int) and not isinstance(new_interval, bool) and new_interval > 0:
+                    poll_interval = math.ceil(new_interval * 1.4)
+                else:
+                    poll_interval = math.ceil(poll_interval * 1.4)
+                last_printed_s = _print_remaining(deadline_ns, last_printed_s)
             elif err in ("expired_token", "access_denied"):
                 sys.stdout.write("\n")
                 raise RuntimeError(f"device_token: {err}")
@@ -207,13 +500,23 @@ def _device_flow(
             sys.stdout.write("\n")
             raise RuntimeError(f"device_token: unexpected response HTTP {r_poll.status}: {r_poll.raw_text[:200]}")
 
-        # Respect server-provided interval (and any slow_down backoff).
-        time.sleep(poll_interval)
+        # Respect server-provided interval (and any slow_down backoff), but never sleep past the deadline.
+        time.sleep(min(poll_interval * _NS_PER_S, max(0, deadline_ns - time.monotonic_ns())) / _NS_PER_S)
 
     sys.stdout.write("\n")
     raise RuntimeError("device_token: timed out waiting for user authorization (device code expired)")
 
 
+def _print_token_summary(token_file: str, access_token: Any, refresh_token: Any, *, file_label: str = "written to") -> None:
+    print(f"- access_token: {_mask(str(access_token))}")
+    if isinstance(refresh_token, str) and refresh_token:
+        print(f"- refresh_token: {_mask(refresh_token)}")
+    print(f"- {file_label}: {os.path.abspath(token_file)}")
+    print("")
+    print("Next:")
+    print(f'  python3 "{os.path.join(_script_dir(), "run_tests.py")}"')
+
+
 def main() -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--base-url", default=BASE_URL_DEFAULT, help="API base URL (must expose /oauth2/device)")
@@ -230,22 +533,59 @@ def main() -> int:
     )
     ap.add_argument("--open-browser", action="store_true", help="Try to open the verification URL in a browser")
     ap.add_argument("--timeout", type=int, default=30, help="HTTP timeout in seconds")
+    ap.add_argument("--force", action="store_true", help="Ignore a still-valid token or pending device code and re-authorize from scratch")
     args = ap.parse_args()
 
+    base_url = _ensure_trailing_slash(args.base_url)
+
+    # Reuse a previously obtained token when possible; the device flow needs user interaction.
+    cached = None if args.force else _load_cached_token(args.token_file)
+    if cached is not None and cached.get("base_url") not in (None, base_url):
+        cached = None
+    if cached is not None and _is_token_fresh(cached):
+        print("Cached token is still valid (use --force to request a new one).")
+        _print_token_summary(args.token_file, cached.get("access_token"), cached.get("refresh_token"), file_label="read from")
+        return 0
+
     if not args.client_id or not args.client_secret:
         print("Missing credentials.")
         print(f"Provide --client-id/--client-secret or set env {ENV_CLIENT_ID}/{ENV_CLIENT_SECRET}.")
         return 2
 
-    base_url = _ensure_trailing_slash(args.base_url)
-
-    token_payload = _device_flow(
-        base_url,
-        client_id=str(args.client_id),
-        client_secret=str(args.client_secret),
-        open_browser=bool(args.open_browser),
-        timeout_s=int(args.timeout),
-    )
+    # One client for the whole flow so every poll reuses the same keep-alive connection.
+    client = _HttpClient(timeout_s=int(args.timeout))
+    try:
+        token_payload: Optional[Dict[str, Any]] = None
+        cached_refresh = cached.get("refresh_token") if cached is not None else None
+        if isinstance(cached_refresh, str) and cached_refresh:
+            try:
+                token_payload = _refresh_access_token(
+                    client,
+                    base_url,
+                    client_id=str(args.client_id),
+                    client_secret=str(args.client_secret),
+                    refresh_token=cached_refresh,
+                    timeout_s=int(args.timeout),
+                )
+                print("Cached token expired; refreshed it.")
+                if not token_payload.get("refresh_token"):
+                    token_payload = dict(token_payload, refresh_token=cached_refresh)
+            except Exception as e:
+                print(f"Token refresh failed ({e}); falling back to device flow.")
+                token_payload = None
+
+        if token_payload is None:
+            token_payload = _device_flow(
+                client,
+                base_url,
+                client_id=str(args.client_id),
+                client_secret=str(args.client_secret),
+                open_browser=bool(args.open_browser),
+                timeout_s=int(args.timeout),
+                state_file=None if args.force else _default_device_state_file(args.token_file),
+            )
+    finally:
+        client.close()
 
     access_token = token_payload.get("access_token")
     refresh_token = token_payload.get("refresh_token")
@@ -266,13 +606,7 @@ def main() -> int:
     _write_json(args.token_file, out_obj)
 
     print("Token obtained.")
-    print(f"- access_token: {_mask(str(access_token))}")
-    if isinstance(refresh_token, str) and refresh_token:
-        print(f"- refresh_token: {_mask(refresh_token)}")
-    print(f"- written to: {os.path.abspath(args.token_file)}")
-    print("")
-    print("Next:")
-    print(f'  python3 "{os.path.join(_script_dir(), "run_tests.py")}"')
+    _print_token_summary(args.token_file, access_token, refresh_token)
     return 0
 
 
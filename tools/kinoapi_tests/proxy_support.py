@@ -0,0 +1,161 @@
+import base64
+import http.client
+import urllib.parse
+import urllib.request
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+
+"""
+Keep-alive http.client connections shared by `run_tests.py` and `extract_token.py`.
+
+- `KeepAliveClient`: reuses idle connections per (scheme, host, port) and retries once when the
+  server closed a reused connection while it sat idle.
+- Environment proxy support (HTTP_PROXY / HTTPS_PROXY / NO_PROXY), mirroring what urllib's
+  ProxyHandler did for these scripts:
+  - https targets are tunnelled through the proxy with CONNECT;
+  - http targets are sent to the proxy with the absolute URL as the request target;
+  - `user:pass@` in the proxy URL becomes a `Proxy-Authorization: Basic ...` header.
+"""
+
+
+# Errors that mean a reused keep-alive connection was closed by the peer while idle.
+STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+
+class ProxyRoute(NamedTuple):
+    host: str
+    port: int
+    # CONNECT tunnel (https targets) vs absolute-URI forwarding (plain http targets).
+    tunnel: bool
+    # Proxy-Authorization when the proxy URL carries credentials, else empty.
+    headers: Dict[str, str]
+
+
+def proxy_route(scheme: str, host: str) -> Optional[ProxyRoute]:
+    """The proxy to use for `scheme`://`host` according to the environment, or None to connect directly."""
+    proxy = urllib.request.getproxies().get(scheme)
+    if not proxy or urllib.request.proxy_bypass(host):
+        return None
+    # Like urllib, accept "host:port" without a scheme.
+    p = urllib.parse.urlsplit(proxy if "://" in proxy else "http://" + proxy)
+    headers: Dict[str, str] = {}
+    if p.username is not None:
+        user_pass = f"{urllib.parse.unquote(p.username)}:{urllib.parse.unquote(p.password or '')}"
+        headers["Proxy-Authorization"] = "Basic " + base64.b64encode(user_pass.encode("utf-8")).decode("ascii")
+    return ProxyRoute(p.hostname or "", p.port or 8080, scheme == "https", headers)
+
+
+def open_connection(
+    scheme: str, host: str, port: int, timeout_s: float, route: Optional[ProxyRoute]
+) -> http.client.HTTPConnection:
+    """A (not yet connected) connection to `host`:`port`, or to the proxy of `route`."""
+    conn_cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+    if route is None:
+        return conn_cls(host, port, timeout=timeout_s)
+    conn = conn_cls(route.host, route.port, timeout=timeout_s)
+    if route.tunnel:
+        conn.set_tunnel(host, port, headers=route.headers or None)
+    return conn
+
+
+def request_target(scheme: str, host: str, port: int, target: str, route: Optional[ProxyRoute]) -> str:
+    """Request-line target: the path as given, or the absolute URL when forwarding through a proxy."""
+    if route is None or route.tunnel:
+        return target
+    netloc = f"[{host}]" if ":" in host else host
+    if port != (443 if scheme == "https" else 80):
+        netloc += f":{port}"
+    return f"{scheme}://{netloc}{target}"
+
+
+class KeepAliveClient:
+    """
+    Minimal keep-alive HTTP client: idle connections are kept per (scheme, host, port) and reused.
+
+    Not thread-safe by itself. Subclasses extend the `_new_connection`, `_checkout`, `_checkin` and
+    `_connect_timeout` hooks (locking, idle caps, DNS caching, ...).
+    """
+
+    def __init__(self, timeout_s: float = 30) -> None:
+        self.timeout_s = timeout_s
+        self._idle: Dict[Tuple[str, str, int], List[http.client.HTTPConnection]] = {}
+        self._routes: Dict[Tuple[str, str, int], Optional[ProxyRoute]] = {}
+
+    @staticmethod
+    def _key(parts: urllib.parse.SplitResult) -> Tuple[str, str, int]:
+        scheme = parts.scheme or "https"
+        return scheme, parts.hostname or "", parts.port or (443 if scheme == "https" else 80)
+
+    def _route(self, key: Tuple[str, str, int]) -> Optional[ProxyRoute]:
+        # Keep honoring HTTP(S)_PROXY / NO_PROXY like urllib did; looked up once per host.
+        try:
+            return self._routes[key]
+        except KeyError:
+            return self._routes.setdefault(key, proxy_route(key[0], key[1]))
+
+    def _new_connection(self, key: Tuple[str, str, int], timeout_s: float) -> http.client.HTTPConnection:
+        return open_connection(*key, timeout_s=timeout_s, route=self._route(key))
+
+    def _checkout(self, key: Tuple[str, str, int], timeout_s: float) -> Tuple[http.client.HTTPConnection, bool]:
+        """An idle connection for `key` (reused=True), else a new unconnected one."""
+        idle = self._idle.get(key)
+        if idle:
+            conn = idle.pop()
+            conn.timeout = timeout_s
+            return conn, True
+        return self._new_connection(key, timeout_s), False
+
+    def _checkin(self, key: Tuple[str, str, int], conn: http.client.HTTPConnection) -> None:
+        self._idle.setdefault(key, []).append(conn)
+
+    def _connect_timeout(self, timeout_s: float) -> float:
+        return timeout_s
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        body: Optional[bytes] = None,
+        timeout_s: Optional[float] = None,
+    ) -> Tuple[int, http.client.HTTPMessage, bytes]:
+        parts = urllib.parse.urlsplit(url)
+        key = self._key(parts)
+        route = self._route(key)
+        target = request_target(*key, (parts.path or "/") + (("?" + parts.query) if parts.query else ""), route)
+        if route is not None and not route.tunnel and route.headers:
+            # Forwarded (not tunnelled) requests carry the proxy credentials themselves.
+            headers = {**headers, **route.headers}
+
+        timeout = self.timeout_s if timeout_s is None else timeout_s
+        connect_timeout = self._connect_timeout(timeout)
+        for attempt in (1, 2):
+            conn, reused = self._checkout(key, connect_timeout)
+            try:
+                if conn.sock is None:
+                    conn.connect()
+                conn.sock.settimeout(timeout)
+                conn.request(method, target, body=body, headers=headers)
+                resp = conn.getresponse()
+                raw = resp.read()
+            except STALE_CONNECTION_ERRORS:
+                conn.close()
+                # The server (or a middlebox) closed this connection while it sat idle: retry once on a new one.
+                if reused and attempt == 1:
+                    continue
+                raise
+            except BaseException:
+                conn.close()
+                raise
+            if resp.will_close:
+                conn.close()
+            else:
+                self._checkin(key, conn)
+            return resp.status, resp.headers, raw
+        raise AssertionError("unreachable")
+
+    def close(self) -> None:
+        idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
@@ -1,14 +1,26 @@
 import argparse
+import atexit
+import concurrent.futures
 import datetime as _dt
+import functools
+import http.client
 import json
+import operator
 import os
 import re
+import sys
+import threading
 import time
-import urllib.error
 import urllib.parse
-import urllib.request
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from proxy_support import KeepAliveClient
+
+try:  # Optional: faster JSON parsing/serialization; falls back to the stdlib json module.
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
 
 
 BASE_URL_DEFAULT = "https://api.service-kp.com/"
@@ -19,7 +31,7 @@ def _now_stamp() -> str:
     return _dt.datetime.now().strftime("%Y-%m-%dT%H-%M-%S")
 
 
-def _is_json_content_type(headers: Dict[str, str]) -> bool:
+def _is_json_content_type(headers: Mapping[str, str]) -> bool:
     ct = headers.get("Content-Type", "")
     return "application/json" in ct or "application/js" in ct or "+json" in ct
 
@@ -28,20 +40,77 @@ def _safe_mkdir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
 
-def _write_text(path: str, text: str) -> None:
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(text)
+# O_BINARY only exists (and matters) on Windows.
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+
+def _write_bytes(path: str, data: bytes) -> None:
+    # Payloads are serialized up front: write them straight to the fd, no buffered file object in between.
+    fd = os.open(path, _WRITE_FLAGS, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            # os.write may write less than asked (e.g. on signals); normally this is one syscall.
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def _dump_json(obj: Any) -> bytes:
+    """Pretty-printed, key-sorted UTF-8 JSON; same layout with or without orjson."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # orjson.JSONEncodeError (a TypeError): e.g. integers beyond 64 bits. The stdlib handles those.
+            pass
+    return json.dumps(obj, ensure_ascii=False, indent=2, sort_keys=True).encode("utf-8")
 
 
 def _write_json(path: str, obj: Any) -> None:
-    _write_text(path, json.dumps(obj, ensure_ascii=False, indent=2, sort_keys=True))
+    _write_bytes(path, _dump_json(obj))
+
+
+# Snapshot files are written in the background so disk I/O doesn't hold up the next request.
+_IO_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="snapshot-writer")
+_pending_writes: List["concurrent.futures.Future[None]"] = []
+_pending_writes_lock = threading.Lock()
+
+
+def _write_json_async(path: str, obj: Any) -> None:
+    """Queue `_write_json(path, obj)`; `obj` must not be modified by the caller afterwards."""
+    fut = _IO_POOL.submit(_write_json, path, obj)
+    with _pending_writes_lock:
+        _pending_writes.append(fut)
+
+
+def _flush_writes() -> None:
+    """Wait for all queued snapshot writes; re-raises the first write error, if any."""
+    with _pending_writes_lock:
+        pending = list(_pending_writes)
+        _pending_writes.clear()
+    for fut in pending:
+        fut.result()
+
+
+# Both token shapes in one alternation, so the body is scanned once.
+_RE_TOKENS = re.compile(
+    r"(?P<bearer>Authorization:\s*Bearer\s+[A-Za-z0-9._~+/=-]+)|(?P<access_token>access_token=[A-Za-z0-9._~+/=-]+)"
+)
+
+
+def _redact_token_match(m: "re.Match[str]") -> str:
+    if m.lastgroup == "bearer":
+        return "Authorization: Bearer <REDACTED>"
+    return "access_token=<REDACTED>"
 
 
 def _redact_tokens(text: str) -> str:
     # Redact Bearer tokens and query params if they ever appear.
-    text = re.sub(r"Authorization:\s*Bearer\s+[A-Za-z0-9._~+/=-]+", "Authorization: Bearer <REDACTED>", text)
-    text = re.sub(r"access_token=[A-Za-z0-9._~+/=-]+", "access_token=<REDACTED>", text)
-    return text
+    # Nearly all bodies contain neither; plain substring checks are much cheaper than the regex scan.
+    if "Bearer" not in text and "access_token=" not in text:
+        return text
+    return _RE_TOKENS.sub(_redact_token_match, text)
 
 
 _SENSITIVE_JSON_KEYS = {
@@ -56,24 +125,58 @@ _SENSITIVE_JSON_KEYS = {
 }
 
 
+# A sensitive key can only be in a body whose bytes contain it as a quoted JSON string.
+# `\u` escapes could spell a key differently, so bodies containing them always get the full walk.
+_RE_SENSITIVE_KEY_BYTES = re.compile(
+    rb'"(?:' + b"|".join(re.escape(k.encode("ascii")) for k in sorted(_SENSITIVE_JSON_KEYS)) + rb')"|\\u',
+    re.IGNORECASE,
+)
+
+
 def _redact_json(obj: Any) -> Any:
     """
     Best-effort redaction of obviously sensitive fields in JSON snapshots.
     Note: snapshots can still contain personal account data; don't commit/share them.
+
+    Walks the tree with an explicit stack (no recursion). Containers are only copied on the path
+    to a redacted key; everything else is shared with `obj`, which is treated as read-only.
     """
-    if obj is None:
-        return None
-    if isinstance(obj, dict):
-        out: Dict[Any, Any] = {}
-        for k, v in obj.items():
-            if isinstance(k, str) and k.lower() in _SENSITIVE_JSON_KEYS:
-                out[k] = "<REDACTED>"
-            else:
-                out[k] = _redact_json(v)
-        return out
-    if isinstance(obj, list):
-        return [_redact_json(x) for x in obj]
-    return obj
+    if not isinstance(obj, (dict, list)):
+        return obj
+    # Frame: [container, iterator over (key, value), replacements by key (None until needed), key in parent]
+    stack: List[List[Any]] = [[obj, iter(obj.items()) if isinstance(obj, dict) else enumerate(obj), None, None]]
+    while True:
+        frame = stack[-1]
+        node, items = frame[0], frame[1]
+        node_is_dict = isinstance(node, dict)
+        for k, v in items:
+            # All sensitive keys are lowercase: only pay for k.lower() on keys that have uppercase letters.
+            if (
+                node_is_dict
+                and isinstance(k, str)
+                and (k in _SENSITIVE_JSON_KEYS or (not k.islower() and k.lower() in _SENSITIVE_JSON_KEYS))
+            ):
+                if frame[2] is None:
+                    frame[2] = {}
+                frame[2][k] = "<REDACTED>"
+            elif v and isinstance(v, (dict, list)):
+                stack.append([v, iter(v.items()) if isinstance(v, dict) else enumerate(v), None, k])
+                break
+        else:
+            stack.pop()
+            changes = frame[2]
+            out: Any = node
+            if changes is not None:
+                out = dict(node) if node_is_dict else list(node)
+                for k, v in changes.items():
+                    out[k] = v
+            if not stack:
+                return out
+            if out is not node:
+                parent = stack[-1]
+                if parent[2] is None:
+                    parent[2] = {}
+                parent[2][frame[3]] = out
 
 
 def _ensure_trailing_slash(url: str) -> str:
@@ -107,6 +210,8 @@ def _default_token_file() -> str:
     return os.path.join(_script_dir(), ".local", "access_token.txt")
 
 
+# The token file doesn't change during a run; call _read_token_file.cache_clear() after rewriting it.
+@functools.lru_cache(maxsize=4)
 def _read_token_file(path: str) -> Optional[str]:
     try:
         with open(path, "r", encoding="utf-8") as f:
@@ -155,12 +260,207 @@ def _resolve_access_token(token_arg: Optional[str], token_file: str) -> Tuple[Op
 # ---------------- HTTP helpers ----------------
 
 
+# urllib used to send this; keep it so the API sees the same client.
+_USER_AGENT = f"Python-urllib/{sys.version_info[0]}.{sys.version_info[1]}"
+
+_REDIRECT_CODES = (301, 302, 303, 307, 308)
+_MAX_REDIRECTS = 10
+
+# Transient statuses (rate limit, gateway/backend hiccups) retried for requests sent with retry=True.
+# Retrying is opt-in per call site, not chosen by HTTP method: several of the suite's GETs change account
+# state (watching marktime/toggle/togglewatchlist, item votes, api2 notifications), and a 502/504 doesn't
+# say whether the backend already applied them. Only the read-only tests of the _run_dag table opt in.
+_RETRY_CODES = frozenset((429, 502, 503, 504))
+_MAX_RETRIES = 3
+_RETRY_BACKOFF_S = 0.3
+_MAX_RETRY_AFTER_S = 10.0
+
+
+class _ConnectionPool(KeepAliveClient):
+    """
+    Thread-safe pool of keep-alive connections keyed by (scheme, host, port).
+
+    The suite sends dozens of requests to the same host; `urlopen` paid a TCP + TLS handshake
+    for each of them. Idle connections are kept here and reused by the next request.
+    """
+
+    def __init__(self, max_idle_per_host: int = 8, connect_timeout_s: float = 5) -> None:
+        super().__init__()
+        self._max_idle = max_idle_per_host
+        self._connect_timeout_s = connect_timeout_s
+        self._lock = threading.Lock()
+
+    def _checkout(self, key: Tuple[str, str, int], timeout_s: float) -> Tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            return super()._checkout(key, timeout_s)
+
+    def _checkin(self, key: Tuple[str, str, int], conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            if len(self._idle.get(key, ())) < self._max_idle:
+                super()._checkin(key, conn)
+                return
+        # Concurrent bursts can open more connections than later requests will reuse; close the surplus.
+        conn.close()
+
+    def _connect_timeout(self, timeout_s: float) -> float:
+        # A dead host should fail fast; `timeout_s` then bounds each read of a slow response.
+        return min(self._connect_timeout_s, timeout_s)
+
+    def prime(self, url: str, count: int = 1) -> None:
+        """
+        Open up to `count` connections to the host of `url` (in parallel) and park them in the pool.
+
+        Moves the TCP + TLS handshakes off the first requests. Failures are ignored: the real
+        requests will report them.
+        """
+        key = self._key(urllib.parse.urlsplit(url))
+        count = max(1, min(count, self._max_idle))
+
+        def connect() -> None:
+            conn = self._new_connection(key, self._connect_timeout_s)
+            try:
+                conn.connect()
+            except OSError:
+                conn.close()
+                return
+            self._checkin(key, conn)
+
+        if count == 1:
+            connect()
+            return
+        with concurrent.futures.ThreadPoolExecutor(max_workers=count) as ex:
+            for _ in range(count):
+                ex.submit(connect)
+
+    def close(self) -> None:
+        with self._lock:
+            super().close()
+
+
+_POOL = _ConnectionPool()
+atexit.register(_POOL.close)
+
+
+def _retry_delay_s(attempt: int, resp_headers: http.client.HTTPMessage) -> float:
+    """Exponential backoff (0.3s, 0.6s, 1.2s, ...), or the server's Retry-After seconds when given (capped)."""
+    retry_after = resp_headers.get("Retry-After")
+    if retry_after and retry_after.strip().isdigit():
+        return min(float(retry_after), _MAX_RETRY_AFTER_S)
+    return _RETRY_BACKOFF_S * (2 ** attempt)
+
+
+def _request_with_retry(
+    method: str,
+    url: str,
+    headers: Dict[str, str],
+    data: Optional[bytes],
+    timeout_s: int,
+) -> Tuple[int, http.client.HTTPMessage, bytes]:
+    # Retries reuse the pooled keep-alive connection, so a flaky 503 costs a short sleep, not a failed test.
+    attempt = 0
+    while True:
+        status, resp_headers, raw = _POOL.request(method, url, headers, data, timeout_s)
+        if status not in _RETRY_CODES or attempt >= _MAX_RETRIES:
+            return status, resp_headers, raw
+        time.sleep(_retry_delay_s(attempt, resp_headers))
+        attempt += 1
+
+
+def _send(
+    method: str,
+    url: str,
+    headers: Dict[str, str],
+    data: Optional[bytes],
+    timeout_s: int,
+    retry: bool = False,
+) -> Tuple[int, http.client.HTTPMessage, bytes]:
+    """
+    Send one request through the pool, following redirects the same way urllib did:
+    GET/HEAD follow 301/302/303/307/308, POST follows 301/302/303 as a body-less GET.
+    With `retry`, 429/502/503/504 answers are retried with backoff (see `_request_with_retry`);
+    only pass it for requests that are safe to repeat.
+    """
+    headers = dict(headers)
+    headers.setdefault("User-Agent", _USER_AGENT)
+    if data is not None:
+        headers.setdefault("Content-Type", "application/x-www-form-urlencoded")
+
+    for _ in range(_MAX_REDIRECTS + 1):
+        if retry:
+            status, resp_headers, raw = _request_with_retry(method, url, headers, data, timeout_s)
+        else:
+            status, resp_headers, raw = _POOL.request(method, url, headers, data, timeout_s)
+        location = resp_headers.get("Location")
+        if status not in _REDIRECT_CODES or not location:
+            return status, resp_headers, raw
+        if method in ("GET", "HEAD"):
+            pass
+        elif method == "POST" and status in (301, 302, 303):
+            method, data = "GET", None
+            headers = {k: v for k, v in headers.items() if k.lower() not in ("content-type", "content-length")}
+        else:
+            return status, resp_headers, raw
+        url = urllib.parse.urljoin(url, location)
+    return status, resp_headers, raw
+
+
 @dataclass
 class HttpResponse:
     status: int
-    headers: Dict[str, str]
-    raw_text: str
-    json: Optional[Any]
+    headers: Mapping[str, str]  # the response's http.client.HTTPMessage (case-insensitive lookups)
+    raw: bytes
+
+    @functools.cached_property
+    def json(self) -> Optional[Any]:
+        # Parsed on first access (validation or snapshot), at most once; None when the body isn't JSON.
+        raw = self.raw
+        if not raw or not (_is_json_content_type(self.headers) or _peek_json(raw)):
+            return None
+        try:
+            return _loads_json(raw)
+        except Exception:
+            return None
+
+    @functools.cached_property
+    def raw_text(self) -> str:
+        # Decoded on first use (snapshots); JSON is parsed from `raw` directly.
+        return self.raw.decode("utf-8", errors="replace")
+
+
+def _fast_urlencode(params: Dict[str, Any]) -> str:
+    """`urlencode(params, doseq=True)` with a shortcut for the common single scalar parameter."""
+    if len(params) == 1:
+        ((k, v),) = params.items()
+        if isinstance(k, str) and type(v) in (str, int):
+            return urllib.parse.quote_plus(k) + "=" + urllib.parse.quote_plus(str(v))
+    return urllib.parse.urlencode(params, doseq=True)
+
+
+def _loads_json(raw: bytes) -> Any:
+    """Parse a response body straight from bytes; orjson when installed, else the stdlib."""
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except ValueError:
+            # orjson is stricter (NaN/Infinity, >64-bit integers): let the stdlib decide.
+            pass
+    # json.loads accepts bytes: no intermediate str copy of the body.
+    return json.loads(raw)
+
+
+def _peek_json(raw: bytes) -> bool:
+    """Whether the body looks like a JSON object/array, judging by its first 64 bytes only."""
+    return raw[:64].lstrip()[:1] in (b"{", b"[")
+
+
+# Headers sent with every API request; copied per call, then extended.
+_BASE_HEADERS_JSON = {"Accept": "application/json"}
+
+
+@functools.lru_cache(maxsize=4)
+def _auth_headers(token: str) -> Tuple[Tuple[str, str], ...]:
+    # The suite sends one token with every request: build the authorized base headers once.
+    return tuple(_BASE_HEADERS_JSON.items()) + (("Authorization", f"Bearer {token}"),)
 
 
 def _http_request(
@@ -174,24 +474,20 @@ def _http_request(
     body_content_type: Optional[str] = None,
     extra_headers: Optional[Dict[str, str]] = None,
     timeout_s: int = 30,
+    retry: bool = False,
 ) -> HttpResponse:
     url = base_url.rstrip("/") + "/" + path.lstrip("/")
     if query:
-        url += "?" + urllib.parse.urlencode(query, doseq=True)
+        url += "?" + _fast_urlencode(query)
 
     if form is not None and body is not None:
         raise ValueError("Provide either form=... or body=..., not both.")
 
     data: Optional[bytes] = None
-    headers: Dict[str, str] = {}
-
-    headers["Accept"] = "application/json"
-
-    if token:
-        headers["Authorization"] = f"Bearer {token}"
+    headers = dict(_auth_headers(token)) if token else dict(_BASE_HEADERS_JSON)
 
     if form is not None:
-        data = urllib.parse.urlencode(form, doseq=True).encode("utf-8")
+        data = _fast_urlencode(form).encode("utf-8")
         headers["Content-Type"] = "application/x-www-form-urlencoded"
     elif body is not None:
         data = body
@@ -201,29 +497,34 @@ def _http_request(
     if extra_headers:
         headers.update(extra_headers)
 
-    req = urllib.request.Request(url, method=method.upper(), headers=headers)
+    status, resp_headers, raw = _send(method.upper(), url, headers, data, timeout_s, retry)
+    return HttpResponse(status=status, headers=resp_headers, raw=raw)
 
-    try:
-        with urllib.request.urlopen(req, data=data, timeout=timeout_s) as resp:
-            raw = resp.read()
-            status = resp.status
-            resp_headers = {k: v for k, v in resp.headers.items()}
-    except urllib.error.HTTPError as e:
-        raw = e.read()
-        status = e.code
-        resp_headers = {k: v for k, v in e.headers.items()}
-
-    raw_text = raw.decode("utf-8", errors="replace")
-    parsed_json: Optional[Any] = None
-    if raw_text:
-        is_jsonish = _is_json_content_type(resp_headers) or raw_text.lstrip().startswith(("{", "["))
-        if is_jsonish:
-            try:
-                parsed_json = json.loads(raw_text)
-            except Exception:
-                parsed_json = None
 
-    return HttpResponse(status=status, headers=resp_headers, raw_text=raw_text, json=parsed_json)
+def _request_many(
+    base_url: str,
+    token: Optional[str],
+    requests: List[Tuple[str, str, Optional[Dict[str, Any]]]],
+    retry: bool = False,
+) -> List[HttpResponse]:
+    """Issue independent requests (method, path, query) concurrently; responses come back in request order."""
+    if len(requests) <= 1:
+        return [_http_request(base_url, method, path, token=token, query=query, retry=retry) for method, path, query in requests]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(requests)) as ex:
+        futures = [
+            ex.submit(_http_request, base_url, method, path, token=token, query=query, retry=retry) for method, path, query in requests
+        ]
+        return [fut.result() for fut in futures]
+
+
+def _get_many(
+    base_url: str,
+    token: Optional[str],
+    requests: List[Tuple[str, Optional[Dict[str, Any]]]],
+    retry: bool = False,
+) -> List[HttpResponse]:
+    """Issue independent GETs (path, query) concurrently; responses come back in request order."""
+    return _request_many(base_url, token, [("GET", path, query) for path, query in requests], retry=retry)
 
 
 # ---------------- Validation helpers (shape-based) ----------------
@@ -238,28 +539,96 @@ def _require(cond: bool, msg: str, errors: List[str]) -> None:
         errors.append(msg)
 
 
+# The _expect_* helpers format their message only on failure; passing checks allocate nothing.
+# JSON decoding yields exact int/float/str/bool instances, so `type(x) is int` also rules out bools.
+
+
 def _expect_obj(x: Any, where: str, errors: List[str]) -> None:
-    _require(isinstance(x, dict), f"{where}: expected object, got {_type_name(x)}", errors)
+    if not isinstance(x, dict):
+        errors.append(f"{where}: expected object, got {_type_name(x)}")
 
 
 def _expect_list(x: Any, where: str, errors: List[str]) -> None:
-    _require(isinstance(x, list), f"{where}: expected array, got {_type_name(x)}", errors)
+    if not isinstance(x, list):
+        errors.append(f"{where}: expected array, got {_type_name(x)}")
 
 
 def _expect_str(x: Any, where: str, errors: List[str]) -> None:
-    _require(isinstance(x, str), f"{where}: expected string, got {_type_name(x)}", errors)
+    if not isinstance(x, str):
+        errors.append(f"{where}: expected string, got {_type_name(x)}")
 
 
 def _expect_int(x: Any, where: str, errors: List[str]) -> None:
-    _require(isinstance(x, int) and not isinstance(x, bool), f"{where}: expected int, got {_type_name(x)}", errors)
+    if type(x) is not int:
+        errors.append(f"{where}: expected int, got {_type_name(x)}")
 
 
 def _expect_bool(x: Any, where: str, errors: List[str]) -> None:
-    _require(isinstance(x, bool), f"{where}: expected bool, got {_type_name(x)}", errors)
+    if not isinstance(x, bool):
+        errors.append(f"{where}: expected bool, got {_type_name(x)}")
 
 
 def _expect_num(x: Any, where: str, errors: List[str]) -> None:
-    _require(isinstance(x, (int, float)) and not isinstance(x, bool), f"{where}: expected number, got {_type_name(x)}", errors)
+    if type(x) not in (int, float):
+        errors.append(f"{where}: expected number, got {_type_name(x)}")
+
+
+_SHAPE_TYPE_NAMES = {int: "int", str: "string", bool: "bool", dict: "object", list: "array"}
+
+
+class _Shape:
+    """
+    Declarative (key, type) spec of a JSON object, with one prebuilt itemgetter fetching all keys at once.
+    """
+
+    __slots__ = ("fields", "get_all")
+
+    def __init__(self, *fields: Tuple[str, type]) -> None:
+        self.fields = fields
+        getter = operator.itemgetter(*(key for key, _ in fields))
+        # itemgetter with a single key returns the bare value; always hand back a tuple.
+        self.get_all: Callable[[Dict[str, Any]], Tuple[Any, ...]] = getter if len(fields) > 1 else (lambda obj: (getter(obj),))
+
+
+# Specs for recurring response objects, built once at import.
+_CATALOG_STR_ID_SHAPE = _Shape(("id", str), ("title", str))
+_CATALOG_INT_ID_SHAPE = _Shape(("id", int), ("title", str))
+_ITEM_SHAPE = _Shape(("id", int), ("title", str), ("type", str))
+_PAGINATION_SHAPE = _Shape(("total", int), ("current", int), ("perpage", int))
+_DEVICE_CODE_SHAPE = _Shape(("code", str), ("user_code", str), ("verification_uri", str), ("expires_in", int), ("interval", int))
+_DEVICE_TOKEN_SHAPE = _Shape(("access_token", str), ("refresh_token", str), ("expires_in", int))
+
+
+def _expect_fields(obj: Dict[str, Any], shape: _Shape, where: str, errors: List[str]) -> None:
+    """Check the `shape` keys of an object; same messages as the per-key _expect_<type> calls."""
+    try:
+        values = shape.get_all(obj)
+    except KeyError:
+        # Some key is missing: fall back to .get() so it is reported as NoneType like before.
+        values = tuple(obj.get(key) for key, _ in shape.fields)
+    for (key, typ), v in zip(shape.fields, values):
+        if type(v) is not typ:
+            errors.append(f"{where}.{key}: expected {_SHAPE_TYPE_NAMES[typ]}, got {_type_name(v)}")
+
+
+def _batch_expect_shape(items: List[Any], shape: _Shape, where: str, errors: List[str]) -> None:
+    """
+    Check every element of `items` is an object whose `shape` keys have the given types.
+    Same checks and messages as _expect_obj + _expect_<type> per element, in a single loop.
+    """
+    for i, it in enumerate(items):
+        if not isinstance(it, dict):
+            errors.append(f"{where}[{i}]: expected object, got {_type_name(it)}")
+            continue
+        _expect_fields(it, shape, f"{where}[{i}]", errors)
+
+
+def _as_dict(x: Any, where: str, errors: List[str]) -> Optional[Dict[str, Any]]:
+    """`x` if it is a JSON object; otherwise record the _expect_obj error and return None."""
+    if isinstance(x, dict):
+        return x
+    errors.append(f"{where}: expected object, got {_type_name(x)}")
+    return None
 
 
 def _get(obj: dict, key: str) -> Any:
@@ -283,40 +652,89 @@ class TestOutcome:
     context_updates: Dict[str, Any]
 
 
+# Placeholder request headers recorded in snapshot metadata. Shared by all tests: treat as read-only
+# (_save_snapshot copies it before redacting).
+_AUTH_HDR = {"Authorization": "Bearer <token>"}
+
+
+def _snap_meta(method: str, path: str) -> Callable[..., Dict[str, Any]]:
+    """
+    Snapshot request-metadata builder for a fixed endpoint: build(query=None) -> {method, path, [query], headers}.
+    Without a query it returns one shared dict; _save_snapshot never mutates its input.
+    """
+    const = {"method": method, "path": path, "headers": _AUTH_HDR}
+
+    def build(query: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        return {**const, "query": query} if query is not None else const
+
+    return build
+
+
+_SNAP_COLLECTIONS = _snap_meta("GET", "/v1/collections")
+_SNAP_COLLECTIONS_VIEW = _snap_meta("GET", "/v1/collections/view")
+_SNAP_COUNTRIES = _snap_meta("GET", "/v1/countries")
+_SNAP_GENRES = _snap_meta("GET", "/v1/genres")
+_SNAP_ITEMS = _snap_meta("GET", "/v1/items")
+_SNAP_ITEMS_COMMENTS = _snap_meta("GET", "/v1/items/comments")
+_SNAP_ITEMS_MEDIA_LINKS = _snap_meta("GET", "/v1/items/media-links")
+_SNAP_ITEMS_MEDIA_VIDEO_LINK = _snap_meta("GET", "/v1/items/media-video-link")
+_SNAP_ITEMS_SEARCH = _snap_meta("GET", "/v1/items/search")
+_SNAP_ITEMS_SIMILAR = _snap_meta("GET", "/v1/items/similar")
+_SNAP_ITEMS_TRAILER = _snap_meta("GET", "/v1/items/trailer")
+_SNAP_ITEMS_VOTE = _snap_meta("GET", "/v1/items/vote")
+_SNAP_SUBTITLES = _snap_meta("GET", "/v1/subtitles")
+_SNAP_TYPES = _snap_meta("GET", "/v1/types")
+_SNAP_USER = _snap_meta("GET", "/v1/user")
+
+# Request query/form parameters that are replaced with <REDACTED> in snapshots.
+_SNAPSHOT_SENSITIVE_PARAMS = ("device_token", "access_token", "refresh_token", "client_secret")
+
+
+@functools.lru_cache(maxsize=None)
+def _dir_prefix(out_dir: str) -> str:
+    # `out_dir` with exactly one trailing separator; the output dir is fixed for a run.
+    return os.path.join(out_dir, "")
+
+
 def _save_snapshot(out_dir: str, test_id: str, req: Dict[str, Any], resp: HttpResponse) -> None:
-    safe_req = json.loads(json.dumps(req))  # deep copy
+    # Copy only the levels we may redact below; `req` is small and always plain Python data.
+    safe_req = dict(req)
+    for section in ("headers", "query", "form"):
+        if isinstance(safe_req.get(section), dict):
+            safe_req[section] = dict(safe_req[section])
     if "headers" in safe_req and isinstance(safe_req["headers"], dict):
         if "Authorization" in safe_req["headers"]:
             safe_req["headers"]["Authorization"] = "Bearer <REDACTED>"
-    if "query" in safe_req and isinstance(safe_req["query"], dict):
-        for k in ["device_token", "access_token", "refresh_token", "client_secret"]:
-            if k in safe_req["query"] and safe_req["query"][k] is not None:
-                safe_req["query"][k] = "<REDACTED>"
-    if "form" in safe_req and isinstance(safe_req["form"], dict):
-        for k in ["device_token", "access_token", "refresh_token", "client_secret"]:
-            if k in safe_req["form"] and safe_req["form"][k] is not None:
-                safe_req["form"][k] = "<REDACTED>"
+    for section in ("query", "form"):
+        params = safe_req.get(section)
+        if isinstance(params, dict):
+            for k in _SNAPSHOT_SENSITIVE_PARAMS:
+                if params.get(k) is not None:
+                    params[k] = "<REDACTED>"
     safe = {
         "request": safe_req,
         "response": {
             "status": resp.status,
-            "headers": resp.headers,
+            # Plain dict for the (background) JSON writer; the last value wins for repeated headers.
+            "headers": dict(resp.headers.items()),
             "raw_text": _redact_tokens(resp.raw_text),
-            "json": _redact_json(resp.json),
+            # The tree walk only runs when the raw body could hold a sensitive key at all.
+            "json": _redact_json(resp.json) if _RE_SENSITIVE_KEY_BYTES.search(resp.raw) else resp.json,
         },
     }
-    _write_json(os.path.join(out_dir, f"{test_id}.snapshot.json"), safe)
+    _write_json_async(_dir_prefix(out_dir) + test_id + ".snapshot.json", safe)
 
 
 def test_user(base_url: str, token: str, out_dir: str) -> TestOutcome:
     errors: List[str] = []
-    resp = _http_request(base_url, "GET", "/v1/user", token=token)
-    _save_snapshot(out_dir, "user_get", {"method": "GET", "path": "/v1/user", "headers": {"Authorization": "Bearer <token>"}}, resp)
+    resp = _http_request(base_url, "GET", "/v1/user", token=token, retry=True)
+    _save_snapshot(out_dir, "user_get", _SNAP_USER(), resp)
 
     _require(resp.json is not None, "response is not JSON", errors)
-    if isinstance(resp.json, dict):
-        _expect_int(_get(resp.json, "status"), "status", errors)
-        user = _get(resp.json, "user")
+    obj = _as_dict(resp.json, "root", errors)
+    if obj is not None:
+        _expect_int(_get(obj, "status"), "status", errors)
+        user = _get(obj, "user")
         _expect_obj(user, "user", errors)
         if isinstance(user, dict):
             _expect_str(_get(user, "username"), "user.username", errors)
@@ -328,8 +746,6 @@ def test_user(base_url: str, token: str, out_dir: str) -> TestOutcome:
             prof = user.get("profile")
             if prof is not None:
                 _expect_obj(prof, "user.profile", errors)
-    else:
-        _expect_obj(resp.json, "root", errors)
 
     return TestOutcome(status="PASS" if not errors else "FAIL", errors=errors, context_updates={})
 
@@ -354,11 +770,7 @@ def test_oauth_device_flow_pending(base_url: str, out_dir: str, client_id: str,
     code: Optional[str] = None
     if isinstance(r_code.json, dict):
         code = r_code.json.get("code")
-        _expect_str(code, "device_code.code", errors)
-        _expect_str(r_code.json.get("user_code"), "device_code.user_code", errors)
-        _expect_str(r_code.json.get("verification_uri"), "device_code.verification_uri", errors)
-        _expect_int(r_code.json.get("expires_in"), "device_code.expires_in", errors)
-        _expect_int(r_code.json.get("interval"), "device_code.interval", errors)
+        _expect_fields(r_code.json, _DEVICE_CODE_SHAPE, "device_code", errors)
 
     if not code:
         errors.append("device_code: missing code; cannot test device_token polling")
@@ -383,9 +795,7 @@ def test_oauth_device_flow_pending(base_url: str, out_dir: str, client_id: str,
         if "error" in r_poll.json:
             _expect_str(r_poll.json.get("error"), "device_token.error", errors)
         else:
-            _expect_str(r_poll.json.get("access_token"), "device_token.access_token", errors)
-            _expect_str(r_poll.json.get("refresh_token"), "device_token.refresh_token", errors)
-            _expect_int(r_poll.json.get("expires_in"), "device_token.expires_in", errors)
+            _expect_fields(r_poll.json, _DEVICE_TOKEN_SHAPE, "device_token", errors)
 
     return TestOutcome(status="PASS" if not errors else "FAIL", errors=errors, context_updates={})
 
@@ -407,17 +817,16 @@ def test_api2_items_search(api2_base_url: str, token: str, out_dir: str) -> Tupl
     )
     _require(resp.json is not None, "api2 search: response is not JSON", errors)
     item_id: Optional[int] = None
-    if isinstance(resp.json, dict):
+    obj = _as_dict(resp.json, "api2 search root", errors)
+    if obj is not None:
         # Likely similar to ItemsResponse: {status, items:[{id,...}], ...}
-        items = resp.json.get("items")
+        items = obj.get("items")
         if isinstance(items, list) and items:
             it0 = items[0]
             if isinstance(it0, dict) and isinstance(it0.get("id"), int):
                 item_id = it0["id"]
         if item_id is None:
             errors.append("api2 search: could not pick itemId from items[]")
-    else:
-        _expect_obj(resp.json, "api2 search root", errors)
     return TestOutcome(status="PASS" if not errors else "FAIL", errors=errors, context_updates={}), item_id
 
 
@@ -436,25 +845,24 @@ def test_api2_item_details(api2_base_url: str, token: str, out_dir: str, item_id
     )
     _require(resp.json is not None, "api2 item: response is not JSON", errors)
     meta: Dict[str, Optional[int]] = {"imdb_id": None, "kinopoisk_id": None}
-    if isinstance(resp.json, dict):
+    obj = _as_dict(resp.json, "api2 item root", errors)
+    if obj is not None:
         # Best-effort sanity: ensure some top-level object fields exist
-        if "item" in resp.json:
-            _expect_obj(resp.json.get("item"), "api2 item.item", errors)
-            if isinstance(resp.json.get("item"), dict):
-                it = resp.json["item"]
+        if "item" in obj:
+            _expect_obj(obj.get("item"), "api2 item.item", errors)
+            if isinstance(obj.get("item"), dict):
+                it = obj["item"]
                 imdb = it.get("imdb")
                 kp = it.get("kinopoisk")
-                if isinstance(imdb, int) and not isinstance(imdb, bool):
+                if type(imdb) is int:
                     meta["imdb_id"] = imdb
-                if isinstance(kp, int) and not isinstance(kp, bool):
+                if type(kp) is int:
                     meta["kinopoisk_id"] = kp
-        elif "id" in resp.json:
-            _expect_int(resp.json.get("id"), "api2 item.id", errors)
+        elif "id" in obj:
+            _expect_int(obj.get("id"), "api2 item.id", errors)
         else:
             # Not sure yet; keep snapshot for further analysis
             pass
-    else:
-        _expect_obj(resp.json, "api2 item root", errors)
     return TestOutcome(status="PASS" if not errors else "FAIL", errors=errors, context_updates=meta)
 
 
@@ -569,12 +977,11 @@ def test_api2_item_collections(api2_base_url: str, token: str, out_dir: str, ite
         resp,
     )
     _require(resp.json is not None, "api2 item collections: response is not JSON", errors)
-    if isinstance(resp.json, dict):
+    obj = _as_dict(resp.json, "api2 collections root", errors)
+    if obj is not None:
         # Best-effort: it might be {status, items:[...]} or {items:[...]}.
-        if "items" in resp.json:
-            _expect_list(resp.json.get("items"), "api2 collections.items", errors)
-    else:
-        _expect_obj(resp.json, "api2 collections root", errors)
+        if "items" in obj:
+            _expect_list(obj.get("items"), "api2 collections.items", errors)
     return TestOutcome(status="PASS" if not errors else "FAIL", errors=errors, context_updates={})
 
 
@@ -603,79 +1010,65 @@ def test_api2_imdb(api2_base_url: str, token: str, out_dir: str, imdb_ids_csv: s
 
 def test_types(base_url: str, token: str, out_dir: str) -> Tuple[TestOutcome, List[int]]:
     errors: List[str] = []
-    resp = _http_request(base_url, "GET", "/v1/types", token=token)
-    _save_snapshot(out_dir, "content_types", {"method": "GET", "path": "/v1/types", "headers": {"Authorization": "Bearer <token>"}}, resp)
+    resp = _http_request(base_url, "GET", "/v1/types", token=token, retry=True)
+    _save_snapshot(out_dir, "content_types", _SNAP_TYPES(), resp)
     _require(resp.json is not None, "response is not JSON", errors)
-    if isinstance(resp.json, dict):
-        _expect_int(resp.json.get("status"), "types.status", errors)
-        items = resp.json.get("items")
+    obj = _as_dict(resp.json, "types.root", errors)
+    if obj is not None:
+        _expect_int(obj.get("status"), "types.status", errors)
+        items = obj.get("items")
         _expect_list(items, "types.items", errors)
         if isinstance(items, list):
-            for i, it in enumerate(items[:5]):
-                _expect_obj(it, f"types.items[{i}]", errors)
-                if isinstance(it, dict):
-                    _expect_str(it.get("id"), f"types.items[{i}].id", errors)
-                    _expect_str(it.get("title"), f"types.items[{i}].title", errors)
-    else:
-        _expect_obj(resp.json, "types.root", errors)
+            _batch_expect_shape(items[:5], _CATALOG_STR_ID_SHAPE, "types.items", errors)
     return TestOutcome(status="PASS" if not errors else "FAIL", errors=errors, context_updates={}), []
 
 
 def test_genres(base_url: str, token: str, out_dir: str) -> Tuple[TestOutcome, Optional[int]]:
     errors: List[str] = []
-    resp = _http_request(base_url, "GET", "/v1/genres", token=token)
-    _save_snapshot(out_dir, "content_genres", {"method": "GET", "path": "/v1/genres", "headers": {"Authorization": "Bearer <token>"}}, resp)
+    resp = _http_request(base_url, "GET", "/v1/genres", token=token, retry=True)
+    _save_snapshot(out_dir, "content_genres", _SNAP_GENRES(), resp)
 
     genre_id: Optional[int] = None
     _require(resp.json is not None, "response is not JSON", errors)
-    if isinstance(resp.json, dict):
-        _expect_int(resp.json.get("status"), "genres.status", errors)
-        items = resp.json.get("items")
+    obj = _as_dict(resp.json, "genres.root", errors)
+    if obj is not None:
+        _expect_int(obj.get("status"), "genres.status", errors)
+        items = obj.get("items")
         _expect_list(items, "genres.items", errors)
         if isinstance(items, list):
             for it in items:
-                if isinstance(it, dict) and isinstance(it.get("id"), int) and not isinstance(it.get("id"), bool):
+                if isinstance(it, dict) and type(it.get("id")) is int:
                     genre_id = it["id"]
                     break
-            for i, it in enumerate(items[:5]):
-                _expect_obj(it, f"genres.items[{i}]", errors)
-                if isinstance(it, dict):
-                    _expect_int(it.get("id"), f"genres.items[{i}].id", errors)
-                    _expect_str(it.get("title"), f"genres.items[{i}].title", errors)
-    else:
-        _expect_obj(resp.json, "genres.root", errors)
+            _batch_expect_shape(items[:5], _CATALOG_INT_ID_SHAPE, "genres.items", errors)
     return TestOutcome(status="PASS" if not errors else "FAIL", errors=errors, context_updates={}), genre_id
 
 
 def test_countries(base_url: str, token: str, out_dir: str) -> TestOutcome:
     errors: List[str] = []
-    resp = _http_request(base_url, "GET", "/v1/countries", token=token)
-    _save_snapshot(out_dir, "content_countries", {"method": "GET", "path": "/v1/countries", "headers": {"Authorization": "Bearer <token>"}}, resp)
+    resp = _http_request(base_url, "GET", "/v1/countries", token=token, retry=True)
+    _save_snapshot(out_dir, "content_countries", _SNAP_COUNTRIES(), resp)
     _require(resp.json is not None, "response is not JSON", errors)
-    if isinstance(resp.json, dict):
-        _expect_int(resp.json.get("status"), "countries.status", errors)
-        items = resp.json.get("items")
+    obj = _as_dict(resp.json, "countries.root", errors)
+    if obj is not None:
+        _expect_int(obj.get("status"), "countries.status", errors)
+        items = obj.get("items")
         _expect_list(items, "countries.items", errors)
         if isinstance(items, list):
-            for i, it in enumerate(items[:5]):
-                _expect_obj(it, f"countries.items[{i}]", errors)
-                if isinstance(it, dict):
-                    _expect_int(it.get("id"), f"countries.items[{i}].id", errors)
-                    _expect_str(it.get("title"), f"countries.items[{i}].title", errors)
-    else:
-        _expect_obj(resp.json, "countries.root", errors)
+            _batch_expect_shape(items[:5], _CATALOG_INT_ID_SHAPE, "countries.items", errors)
     return TestOutcome(status="PASS" if not errors else "FAIL", errors=errors, context_updates={})
 
 
 def test_subtitles(base_url: str, token: str, out_dir: str) -> TestOutcome:
     errors: List[str] = []
-    resp = _http_request(base_url, "GET", "/v1/subtitles", token=token)
-    _save_snapshot(out_dir, "content_subtitles", {"method": "GET", "path": "/v1/subtitles", "headers": {"Authorization": "Bearer <token>"}}, resp)
+    resp = _http_request(base_url, "GET", "/v1/subtitles", token=token, retry=True)
+    _save_snapshot(out_dir, "content_subtitles", _SNAP_SUBTITLES(), resp)
     _require(resp.json is not None, "response is not JSON", errors)
-    if isinstance(resp.json, dict):
-        if "status" in resp.json and resp.json["status"] is not None:
-            _expect_int(resp.json.get("status"), "subtitles.status", errors)
-        items = resp.json.get("items")
+    obj = _as_dict(resp.json, "subtitles.root", errors)
+    if obj is not None:
+        if "status" in obj and obj["status"] is not None:
+            _expect_int(obj.get("status"), "subtitles.status", errors)
+        items = obj.get("items")
         _expect_list(items, "subtitles.items", errors)
         if isinstance(items, list):
             for i, it in enumerate(items[:5]):
@@ -686,50 +1079,46 @@ def test_subtitles(base_url: str, token: str, out_dir: str) -> TestOutcome:
                     # - {lang, title}
                     if "id" in it and it["id"] is not None:
                         vid = it.get("id")
-                        if isinstance(vid, bool) or not isinstance(vid, (int, str)):
+                        if type(vid) not in (int, str):
                             errors.append(f"subtitles.items[{i}].id: expected int|string, got {_type_name(vid)}")
                     if "lang" in it and it["lang"] is not None:
                         _expect_str(it.get("lang"), f"subtitles.items[{i}].lang", errors)
                     if "title" in it and it["title"] is not None:
                         _expect_str(it.get("title"), f"subtitles.items[{i}].title", errors)
-    else:
-        _expect_obj(resp.json, "subtitles.root", errors)
     return TestOutcome(status="PASS" if not errors else "FAIL", errors=errors, context_updates={})
 
 
 def test_search(base_url: str, token: str, out_dir: str) -> TestOutcome:
     errors: List[str] = []
-    resp = _http_request(base_url, "GET", "/v1/items/search", token=token, query={"q": "terminator", "perpage": 5})
+    resp = _http_request(base_url, "GET", "/v1/items/search", token=token, query={"q": "terminator", "perpage": 5}, retry=True)
     _save_snapshot(
         out_dir,
         "content_search",
-        {"method": "GET", "path": "/v1/items/search", "query": {"q": "terminator", "perpage": 5}, "headers": {"Authorization": "Bearer <token>"}},
+        _SNAP_ITEMS_SEARCH({"q": "terminator", "perpage": 5}),
         resp,
     )
     _require(resp.json is not None, "response is not JSON", errors)
-    if isinstance(resp.json, dict):
-        items = resp.json.get("items")
+    obj = _as_dict(resp.json, "root", errors)
+    if obj is not None:
+        items = obj.get("items")
         _expect_list(items, "items", errors)
-    else:
-        _expect_obj(resp.json, "root", errors)
     return TestOutcome(status="PASS" if not errors else "FAIL", errors=errors, context_updates={})
 
 
 def test_similar(base_url: str, token: str, out_dir: str, item_id: int) -> TestOutcome:
     errors: List[str] = []
-    resp = _http_request(base_url, "GET", "/v1/items/similar", token=token, query={"id": item_id})
+    resp = _http_request(base_url, "GET", "/v1/items/similar", token=token, query={"id": item_id}, retry=True)
     _save_snapshot(
         out_dir,
         "content_similar",
-        {"method": "GET", "path": "/v1/items/similar", "query": {"id": item_id}, "headers": {"Authorization": "Bearer <token>"}},
+        _SNAP_ITEMS_SIMILAR({"id": item_id}),
         resp,
     )
     _require(resp.json is not None, "response is not JSON", errors)
-    if isinstance(resp.json, dict):
-        items = resp.json.get("items")
+    obj = _as_dict(resp.json, "root", errors)
+    if obj is not None:
+        items = obj.get("items")
         _expect_list(items, "items", errors)
-    else:
-        _expect_obj(resp.json, "root", errors)
     return TestOutcome(status="PASS" if not errors else "FAIL", errors=errors, context_updates={})
 
 
@@ -740,43 +1129,47 @@ def test_shortcut(base_url: str, token: str, out_dir: str, name: str, *, genre:
         query["genre"] = genre
 
     snap_suffix = "_genre" if genre is not None else ""
-    resp = _http_request(base_url, "GET", f"/v1/items/{name}", token=token, query=query)
+    resp = _http_request(base_url, "GET", f"/v1/items/{name}", token=token, query=query, retry=True)
     _save_snapshot(
         out_dir,
         f"content_{name}{snap_suffix}",
-        {"method": "GET", "path": f"/v1/items/{name}", "query": query, "headers": {"Authorization": "Bearer <token>"}},
+        {"method": "GET", "path": f"/v1/items/{name}", "query": query, "headers": _AUTH_HDR},
         resp,
     )
     _require(resp.json is not None, "response is not JSON", errors)
-    if isinstance(resp.json, dict):
-        items = resp.json.get("items")
+    obj = _as_dict(resp.json, "root", errors)
+    if obj is not None:
+        items = obj.get("items")
         _expect_list(items, "items", errors)
-    else:
-        _expect_obj(resp.json, "root", errors)
     return TestOutcome(status="PASS" if not errors else "FAIL", errors=errors, context_updates={})
 
 
+# Accepted trailer id types. Exact type match, so JSON booleans are rejected.
+_STR_INT = (str, int)
+
+
 def test_trailer(base_url: str, token: str, out_dir: str, item_id: int) -> TestOutcome:
     errors: List[str] = []
-    resp = _http_request(base_url, "GET", "/v1/items/trailer", token=token, query={"id": item_id})
+    resp = _http_request(base_url, "GET", "/v1/items/trailer", token=token, query={"id": item_id}, retry=True)
     _save_snapshot(
         out_dir,
         "content_trailer",
-        {"method": "GET", "path": "/v1/items/trailer", "query": {"id": item_id}, "headers": {"Authorization": "Bearer <token>"}},
+        _SNAP_ITEMS_TRAILER({"id": item_id}),
         resp,
     )
     _require(resp.json is not None, "response is not JSON", errors)
-    if isinstance(resp.json, dict):
-        if "status" in resp.json and resp.json["status"] is not None:
-            _expect_int(resp.json.get("status"), "status", errors)
-        tr = resp.json.get("trailer")
+    obj = _as_dict(resp.json, "root", errors)
+    if obj is not None:
+        if "status" in obj and obj["status"] is not None:
+            _expect_int(obj.get("status"), "status", errors)
+        tr = obj.get("trailer")
         if tr is not None:
             # Live API may return either:
             # - trailer: {id, url?, files?}
             # - trailer: [{id, url}, ...]
             if isinstance(tr, dict):
                 tid = tr.get("id")
-                if tid is not None and not isinstance(tid, (str, int)) or isinstance(tid, bool):
+                if tid is not None and type(tid) not in _STR_INT:
                     errors.append(f"trailer.id: expected string|int, got {_type_name(tid)}")
                 if "url" in tr and tr["url"] is not None:
                     _expect_str(tr.get("url"), "trailer.url", errors)
@@ -788,33 +1181,30 @@ def test_trailer(base_url: str, token: str, out_dir: str, item_id: int) -> TestO
                     _expect_obj(t0, "trailer[0]", errors)
                     if isinstance(t0, dict):
                         tid = t0.get("id")
-                        if tid is not None and (isinstance(tid, bool) or not isinstance(tid, (str, int))):
+                        if tid is not None and type(tid) not in _STR_INT:
                             errors.append(f"trailer[0].id: expected string|int, got {_type_name(tid)}")
                         if "url" in t0 and t0["url"] is not None:
                             _expect_str(t0.get("url"), "trailer[0].url", errors)
             else:
                 errors.append(f"trailer: expected object or array, got {_type_name(tr)}")
-    else:
-        _expect_obj(resp.json, "root", errors)
     return TestOutcome(status="PASS" if not errors else "FAIL", errors=errors, context_updates={})
 
 
 def test_comments(base_url: str, token: str, out_dir: str, item_id: int) -> TestOutcome:
     errors: List[str] = []
-    resp = _http_request(base_url, "GET", "/v1/items/comments", token=token, query={"id": item_id})
+    resp = _http_request(base_url, "GET", "/v1/items/comments", token=token, query={"id": item_id}, retry=True)
     _save_snapshot(
         out_dir,
         "content_comments",
-        {"method": "GET", "path": "/v1/items/comments", "query": {"id": item_id}, "headers": {"Authorization": "Bearer <token>"}},
+        _SNAP_ITEMS_COMMENTS({"id": item_id}),
         resp,
     )
     _require(resp.json is not None, "response is not JSON", errors)
-    if isinstance(resp.json, dict):
-        _expect_int(resp.json.get("status"), "status", errors)
-        comments = resp.json.get("comments")
+    obj = _as_dict(resp.json, "root", errors)
+    if obj is not None:
+        _expect_int(obj.get("status"), "status", errors)
+        comments = obj.get("comments")
         _expect_list(comments, "comments", errors)
-    else:
-        _expect_obj(resp.json, "root", errors)
     return TestOutcome(status="PASS" if not errors else "FAIL", errors=errors, context_updates={})
 
 
@@ -824,37 +1214,35 @@ def test_vote_mutating(base_url: str, token: str, out_dir: str, item_id: int) ->
     _save_snapshot(
         out_dir,
         "content_vote_like",
-        {"method": "GET", "path": "/v1/items/vote", "query": {"id": item_id, "like": 1}, "headers": {"Authorization": "Bearer <token>"}},
+        _SNAP_ITEMS_VOTE({"id": item_id, "like": 1}),
         resp,
     )
     _require(resp.json is not None, "response is not JSON", errors)
-    if isinstance(resp.json, dict):
-        _expect_bool(resp.json.get("voted"), "voted", errors)
-    else:
-        _expect_obj(resp.json, "root", errors)
+    obj = _as_dict(resp.json, "root", errors)
+    if obj is not None:
+        _expect_bool(obj.get("voted"), "voted", errors)
     return TestOutcome(status="PASS" if not errors else "FAIL", errors=errors, context_updates={})
 
 
 def test_collections(base_url: str, token: str, out_dir: str) -> Tuple[TestOutcome, Optional[int]]:
     errors: List[str] = []
-    resp = _http_request(base_url, "GET", "/v1/collections", token=token, query={"page": 1, "perpage": 5})
+    resp = _http_request(base_url, "GET", "/v1/collections", token=token, query={"page": 1, "perpage": 5}, retry=True)
     _save_snapshot(
         out_dir,
         "collections_list",
-        {"method": "GET", "path": "/v1/collections", "query": {"page": 1, "perpage": 5}, "headers": {"Authorization": "Bearer <token>"}},
+        _SNAP_COLLECTIONS({"page": 1, "perpage": 5}),
         resp,
     )
     _require(resp.json is not None, "response is not JSON", errors)
     collection_id: Optional[int] = None
-    if isinstance(resp.json, dict):
-        items = resp.json.get("items")
+    obj = _as_dict(resp.json, "root", errors)
+    if obj is not None:
+        items = obj.get("items")
         _expect_list(items, "items", errors)
         if isinstance(items, list) and items:
             c0 = items[0]
             if isinstance(c0, dict) and isinstance(c0.get("id"), int):
                 collection_id = c0["id"]
-    else:
-        _expect_obj(resp.json, "root", errors)
     if collection_id is None:
         errors.append("could not pick collectionId from /v1/collections")
     return TestOutcome(status="PASS" if not errors else "FAIL", errors=errors, context_updates={}), collection_id
@@ -867,118 +1255,136 @@ def test_collections_sort(base_url: str, token: str, out_dir: str) -> TestOutcom
     errors: List[str] = []
 
     # Try a small set of likely valid sort keys; mark PASS if any yields a normal collections payload.
+    # All candidates are probed at once; the first one (in candidate order) that works wins.
     candidates = ["updated-", "created-", "views-", "watchers-"]
-    last_resp: Optional[HttpResponse] = None
+    probes = _get_many(base_url, token, [("/v1/collections", {"sort": sort, "page": 1, "perpage": 5}) for sort in candidates], retry=True)
+    resp_ok: Optional[HttpResponse] = None
     used: Optional[str] = None
 
-    for sort in candidates:
-        resp = _http_request(base_url, "GET", "/v1/collections", token=token, query={"sort": sort, "page": 1, "perpage": 5})
-        last_resp = resp
+    for sort, resp in zip(candidates, probes):
         if resp.status != 200 or not isinstance(resp.json, dict):
             continue
         if not isinstance(resp.json.get("items"), list):
             continue
-        used = sort
+        resp_ok, used = resp, sort
         break
 
-    if used is None:
+    if resp_ok is None:
         errors.append("collections sort: none of the candidate sort values returned a normal {items: []} payload")
         # Save snapshot of the last attempt to help debugging.
-        if last_resp is not None:
-            _save_snapshot(
-                out_dir,
-                "collections_list_sort",
-                {"method": "GET", "path": "/v1/collections", "query": {"sort": candidates[-1], "page": 1, "perpage": 5}, "headers": {"Authorization": "Bearer <token>"}},
-                last_resp,
-            )
+        _save_snapshot(
+            out_dir,
+            "collections_list_sort",
+            _SNAP_COLLECTIONS({"sort": candidates[-1], "page": 1, "perpage": 5}),
+            probes[-1],
+        )
         return TestOutcome(status="FAIL", errors=errors, context_updates={})
 
-    resp_ok = _http_request(base_url, "GET", "/v1/collections", token=token, query={"sort": used, "page": 1, "perpage": 5})
+    # The winning probe is the snapshot: no need to request it a second time.
     _save_snapshot(
         out_dir,
         "collections_list_sort",
-        {"method": "GET", "path": "/v1/collections", "query": {"sort": used, "page": 1, "perpage": 5}, "headers": {"Authorization": "Bearer <token>"}},
+        _SNAP_COLLECTIONS({"sort": used, "page": 1, "perpage": 5}),
         resp_ok,
     )
 
     _require(resp_ok.status == 200, f"collections sort: expected HTTP 200, got {resp_ok.status}", errors)
     _require(resp_ok.json is not None, "collections sort: response is not JSON", errors)
-    if isinstance(resp_ok.json, dict):
-        if "status" in resp_ok.json and resp_ok.json["status"] is not None:
-            _expect_int(resp_ok.json.get("status"), "collections.sort.status", errors)
-        _expect_list(resp_ok.json.get("items"), "collections.sort.items", errors)
-    else:
-        _expect_obj(resp_ok.json, "collections.sort.root", errors)
+    obj = _as_dict(resp_ok.json, "collections.sort.root", errors)
+    if obj is not None:
+        if "status" in obj and obj["status"] is not None:
+            _expect_int(obj.get("status"), "collections.sort.status", errors)
+        _expect_list(obj.get("items"), "collections.sort.items", errors)
 
     return TestOutcome(status="PASS" if not errors else "FAIL", errors=errors, context_updates={"sort": used})
 
 
 def test_collection_items(base_url: str, token: str, out_dir: str, collection_id: int) -> TestOutcome:
     errors: List[str] = []
-    resp = _http_request(base_url, "GET", "/v1/collections/view", token=token, query={"id": collection_id, "page": 1, "perpage": 5})
+    resp = _http_request(base_url, "GET", "/v1/collections/view", token=token, query={"id": collection_id, "page": 1, "perpage": 5}, retry=True)
     _save_snapshot(
         out_dir,
         "collections_view",
-        {"method": "GET", "path": "/v1/collections/view", "query": {"id": collection_id, "page": 1, "perpage": 5}, "headers": {"Authorization": "Bearer <token>"}},
+        _SNAP_COLLECTIONS_VIEW({"id": collection_id, "page": 1, "perpage": 5}),
         resp,
     )
     _require(resp.json is not None, "response is not JSON", errors)
-    if isinstance(resp.json, dict):
-        items = resp.json.get("items")
+    obj = _as_dict(resp.json, "root", errors)
+    if obj is not None:
+        items = obj.get("items")
         _expect_list(items, "items", errors)
-    else:
-        _expect_obj(resp.json, "root", errors)
     return TestOutcome(status="PASS" if not errors else "FAIL", errors=errors, context_updates={})
 
 
+_REFERENCE_NAMES = ("server-location", "streaming-type", "voiceover-type", "voiceover-author", "video-quality")
+
+# name -> (path, snapshot id, not-JSON message, root/status/items labels), formatted and interned once.
+_REF_LABELS: Dict[str, Tuple[str, ...]] = {
+    name: tuple(
+        sys.intern(x)
+        for x in (
+            f"/v1/references/{name}",
+            f"ref_{name}",
+            f"{name}: response is not JSON",
+            f"{name}.root",
+            f"{name}.status",
+            f"{name}.items",
+        )
+    )
+    for name in _REFERENCE_NAMES
+}
+
+
 def test_references(base_url: str, token: str, out_dir: str) -> TestOutcome:
     errors: List[str] = []
-    for name in ["server-location", "streaming-type", "voiceover-type", "voiceover-author", "video-quality"]:
-        resp = _http_request(base_url, "GET", f"/v1/references/{name}", token=token)
-        _save_snapshot(out_dir, f"ref_{name}", {"method": "GET", "path": f"/v1/references/{name}"}, resp)
-        _require(resp.json is not None, f"{name}: response is not JSON", errors)
-        if isinstance(resp.json, dict):
-            if "status" in resp.json:
-                _expect_int(resp.json.get("status"), f"{name}.status", errors)
-            _expect_list(resp.json.get("items"), f"{name}.items", errors)
-        else:
-            _expect_obj(resp.json, f"{name}.root", errors)
+    labels = [_REF_LABELS[name] for name in _REFERENCE_NAMES]
+    responses = _get_many(base_url, token, [(lbl[0], None) for lbl in labels], retry=True)
+    for (path, snap_id, not_json, root_lbl, status_lbl, items_lbl), resp in zip(labels, responses):
+        _save_snapshot(out_dir, snap_id, {"method": "GET", "path": path}, resp)
+        _require(resp.json is not None, not_json, errors)
+        obj = _as_dict(resp.json, root_lbl, errors)
+        if obj is not None:
+            if "status" in obj:
+                _expect_int(obj.get("status"), status_lbl, errors)
+            _expect_list(obj.get("items"), items_lbl, errors)
     return TestOutcome(status="PASS" if not errors else "FAIL", errors=errors, context_updates={})
 
 
 def test_tv(base_url: str, token: str, out_dir: str) -> TestOutcome:
     errors: List[str] = []
-    resp = _http_request(base_url, "GET", "/v1/tv", token=token)
+    resp = _http_request(base_url, "GET", "/v1/tv", token=token, retry=True)
     _save_snapshot(out_dir, "tv_channels", {"method": "GET", "path": "/v1/tv"}, resp)
     _require(resp.json is not None, "tv: response is not JSON", errors)
-    if isinstance(resp.json, dict):
-        _expect_int(resp.json.get("status"), "tv.status", errors)
-        _expect_list(resp.json.get("channels"), "tv.channels", errors)
-    else:
-        _expect_obj(resp.json, "tv.root", errors)
+    obj = _as_dict(resp.json, "tv.root", errors)
+    if obj is not None:
+        _expect_int(obj.get("status"), "tv.status", errors)
+        _expect_list(obj.get("channels"), "tv.channels", errors)
     return TestOutcome(status="PASS" if not errors else "FAIL", errors=errors, context_updates={})
 
 
 def test_watching(base_url: str, token: str, out_dir: str, item_id: int) -> Tuple[TestOutcome, Optional[int]]:
     errors: List[str] = []
-    resp = _http_request(base_url, "GET", "/v1/watching", token=token, query={"id": item_id})
+    names = ["movies", "serials"]
+    resp, *lists = _get_many(
+        base_url,
+        token,
+        [("/v1/watching", {"id": item_id})] + [(f"/v1/watching/{name}", None) for name in names],
+        retry=True,
+    )
     _save_snapshot(out_dir, "watching_info", {"method": "GET", "path": "/v1/watching", "query": {"id": item_id}}, resp)
     _require(resp.json is not None, "watching: response is not JSON", errors)
-    if isinstance(resp.json, dict):
-        if "status" in resp.json:
-            _expect_int(resp.json.get("status"), "watching.status", errors)
-    else:
-        _expect_obj(resp.json, "watching.root", errors)
+    obj = _as_dict(resp.json, "watching.root", errors)
+    if obj is not None:
+        if "status" in obj:
+            _expect_int(obj.get("status"), "watching.status", errors)
 
     # Lists
-    for name in ["movies", "serials"]:
-        r = _http_request(base_url, "GET", f"/v1/watching/{name}", token=token)
+    for name, r in zip(names, lists):
         _save_snapshot(out_dir, f"watching_{name}", {"method": "GET", "path": f"/v1/watching/{name}"}, r)
         _require(r.json is not None, f"watching/{name}: response is not JSON", errors)
-        if isinstance(r.json, dict):
-            _expect_list(r.json.get("items"), f"watching/{name}.items", errors)
-        else:
-            _expect_obj(r.json, f"watching/{name}.root", errors)
+        obj = _as_dict(r.json, f"watching/{name}.root", errors)
+        if obj is not None:
+            _expect_list(obj.get("items"), f"watching/{name}.items", errors)
 
     return TestOutcome(status="PASS" if not errors else "FAIL", errors=errors, context_updates={}), None
 
@@ -1015,11 +1421,12 @@ def test_history(base_url: str, token: str, out_dir: str) -> Tuple[TestOutcome,
     _require(resp.json is not None, "history: response is not JSON", errors)
 
     picked: Dict[str, Optional[int]] = {"media_id": None, "item_id": None}
-    if isinstance(resp.json, dict):
-        if "history" in resp.json and resp.json["history"] is not None:
-            _expect_list(resp.json.get("history"), "history.history", errors)
-            if isinstance(resp.json.get("history"), list) and resp.json["history"]:
-                h0 = resp.json["history"][0]
+    obj = _as_dict(resp.json, "history.root", errors)
+    if obj is not None:
+        if "history" in obj and obj["history"] is not None:
+            _expect_list(obj.get("history"), "history.history", errors)
+            if isinstance(obj.get("history"), list) and obj["history"]:
+                h0 = obj["history"][0]
                 if isinstance(h0, dict):
                     it = h0.get("item")
                     if isinstance(it, dict) and isinstance(it.get("id"), int):
@@ -1030,8 +1437,6 @@ def test_history(base_url: str, token: str, out_dir: str) -> Tuple[TestOutcome,
         else:
             # field may be missing; docs say it exists. Record mismatch.
             errors.append("history response missing 'history' field")
-    else:
-        _expect_obj(resp.json, "history.root", errors)
 
     return TestOutcome(status="PASS" if not errors else "FAIL", errors=errors, context_updates={}), picked
 
@@ -1039,39 +1444,37 @@ def test_history(base_url: str, token: str, out_dir: str) -> Tuple[TestOutcome,
 def test_history_mutating(base_url: str, token: str, out_dir: str, media_id: Optional[int], season_id: Optional[int], item_id: Optional[int]) -> TestOutcome:
     errors: List[str] = []
 
-    if media_id is not None:
-        r = _http_request(base_url, "POST", "/v1/history/clear-for-media", token=token, query={"id": media_id})
-        _save_snapshot(out_dir, "history_clear_for_media", {"method": "POST", "path": "/v1/history/clear-for-media", "query": {"id": media_id}}, r)
-        _require(r.status == 200 and (r.json is None or (isinstance(r.json, dict) and isinstance(r.json.get("status"), int))), "clear-for-media: expected HTTP 200 with JSON null (or {status:int})", errors)
-    else:
-        errors.append("clear-for-media skipped: no media_id available")
-
-    if season_id is not None:
-        r = _http_request(base_url, "POST", "/v1/history/clear-for-season", token=token, query={"id": season_id})
-        _save_snapshot(out_dir, "history_clear_for_season", {"method": "POST", "path": "/v1/history/clear-for-season", "query": {"id": season_id}}, r)
-        _require(r.status == 200 and (r.json is None or (isinstance(r.json, dict) and isinstance(r.json.get("status"), int))), "clear-for-season: expected HTTP 200 with JSON null (or {status:int})", errors)
-    else:
-        errors.append("clear-for-season skipped: no season_id available")
+    # The three clears are independent: send the available ones together, then check them in order.
+    clears = [("media", media_id), ("season", season_id), ("item", item_id)]
+    todo = [(kind, id_) for kind, id_ in clears if id_ is not None]
+    responses = dict(
+        zip(
+            [kind for kind, _ in todo],
+            _request_many(base_url, token, [("POST", f"/v1/history/clear-for-{kind}", {"id": id_}) for kind, id_ in todo]),
+        )
+    )
 
-    if item_id is not None:
-        r = _http_request(base_url, "POST", "/v1/history/clear-for-item", token=token, query={"id": item_id})
-        _save_snapshot(out_dir, "history_clear_for_item", {"method": "POST", "path": "/v1/history/clear-for-item", "query": {"id": item_id}}, r)
-        _require(r.status == 200 and (r.json is None or (isinstance(r.json, dict) and isinstance(r.json.get("status"), int))), "clear-for-item: expected HTTP 200 with JSON null (or {status:int})", errors)
-    else:
-        errors.append("clear-for-item skipped: no item_id available")
+    for kind, id_ in clears:
+        if id_ is None:
+            errors.append(f"clear-for-{kind} skipped: no {kind}_id available")
+            continue
+        r = responses[kind]
+        _save_snapshot(out_dir, f"history_clear_for_{kind}", {"method": "POST", "path": f"/v1/history/clear-for-{kind}", "query": {"id": id_}}, r)
+        _require(r.status == 200 and (r.json is None or (isinstance(r.json, dict) and isinstance(r.json.get("status"), int))), f"clear-for-{kind}: expected HTTP 200 with JSON null (or {{status:int}})", errors)
 
     return TestOutcome(status="PASS" if not errors else "FAIL", errors=errors, context_updates={})
 
 
 def test_device(base_url: str, token: str, out_dir: str) -> Tuple[TestOutcome, Optional[int]]:
     errors: List[str] = []
-    # List devices
-    resp = _http_request(base_url, "GET", "/v1/device", token=token)
+    # List devices + current device info
+    resp, info = _get_many(base_url, token, [("/v1/device", None), ("/v1/device/info", None)])
     _save_snapshot(out_dir, "device_list", {"method": "GET", "path": "/v1/device"}, resp)
     _require(resp.json is not None, "device: response is not JSON", errors)
     device_id: Optional[int] = None
-    if isinstance(resp.json, dict):
-        devs = resp.json.get("devices")
+    obj = _as_dict(resp.json, "device.root", errors)
+    if obj is not None:
+        devs = obj.get("devices")
         _expect_list(devs, "device.devices", errors)
         if isinstance(devs, list) and devs:
             d0 = devs[0]
@@ -1079,45 +1482,61 @@ def test_device(base_url: str, token: str, out_dir: str) -> Tuple[TestOutcome, O
                 device_id = d0["id"]
             if isinstance(d0, dict) and "is_browser" in d0 and d0["is_browser"] is not None:
                 _expect_bool(d0.get("is_browser"), "device.devices[0].is_browser", errors)
-    else:
-        _expect_obj(resp.json, "device.root", errors)
 
     # Current device info
-    info = _http_request(base_url, "GET", "/v1/device/info", token=token)
     _save_snapshot(out_dir, "device_info", {"method": "GET", "path": "/v1/device/info"}, info)
     _require(info.json is not None, "device/info: response is not JSON", errors)
-    if isinstance(info.json, dict):
-        dev = info.json.get("device")
+    obj = _as_dict(info.json, "device/info.root", errors)
+    if obj is not None:
+        dev = obj.get("device")
         if isinstance(dev, dict) and isinstance(dev.get("id"), int):
             device_id = dev.get("id")
-    else:
-        _expect_obj(info.json, "device/info.root", errors)
 
     if device_id is None:
         errors.append("could not pick deviceId from /v1/device or /v1/device/info")
         return TestOutcome(status="FAIL", errors=errors, context_updates={}), None
 
-    # GET device/{id}
-    d = _http_request(base_url, "GET", f"/v1/device/{device_id}", token=token)
+    # GET device/{id} + device/{id}/settings
+    d, s = _get_many(base_url, token, [(f"/v1/device/{device_id}", None), (f"/v1/device/{device_id}/settings", None)])
     _save_snapshot(out_dir, "device_get", {"method": "GET", "path": f"/v1/device/{device_id}"}, d)
     _require(d.json is not None, "device/{id}: response is not JSON", errors)
 
-    # GET device/{id}/settings
-    s = _http_request(base_url, "GET", f"/v1/device/{device_id}/settings", token=token)
+    # device/{id}/settings
     _save_snapshot(out_dir, "device_settings_get", {"method": "GET", "path": f"/v1/device/{device_id}/settings"}, s)
     _require(s.json is not None, "device/{id}/settings: response is not JSON", errors)
-    if isinstance(s.json, dict):
-        _expect_int(s.json.get("status"), "device.settings.status", errors)
+    obj = _as_dict(s.json, "device/settings.root", errors)
+    if obj is not None:
+        _expect_int(obj.get("status"), "device.settings.status", errors)
         # settings is a map; accept any object/map
-        st = s.json.get("settings")
+        st = obj.get("settings")
         if st is not None:
             _expect_obj(st, "device.settings.settings", errors)
-    else:
-        _expect_obj(s.json, "device/settings.root", errors)
 
     return TestOutcome(status="PASS" if not errors else "FAIL", errors=errors, context_updates={}), device_id
 
 
+def _setting_from_list(val: List[Any]) -> Optional[int]:
+    # List case: value is list of {id, selected}. Prefer the selected option, else the first id; one pass.
+    first_id: Optional[int] = None
+    for opt in val:
+        if isinstance(opt, dict):
+            opt_id = opt.get("id")
+            if isinstance(opt_id, int):
+                if opt.get("selected") in (1, True):
+                    return opt_id
+                if first_id is None:
+                    first_id = opt_id
+    return first_id
+
+
+# Setting value type -> int extractor; values of any other type yield None.
+_SETTING_VALUE_EXTRACTORS: Dict[type, Callable[[Any], Optional[int]]] = {
+    bool: lambda val: 1 if val else 0,
+    int: lambda val: val,
+    list: _setting_from_list,
+}
+
+
 def _extract_setting_value_int(settings_map: Any, key: str) -> Optional[int]:
     if not isinstance(settings_map, dict):
         return None
@@ -1125,23 +1544,8 @@ def _extract_setting_value_int(settings_map: Any, key: str) -> Optional[int]:
     if not isinstance(entry, dict):
         return None
     val = entry.get("value")
-    if isinstance(val, bool):
-        return 1 if val else 0
-    if isinstance(val, int) and not isinstance(val, bool):
-        return val
-    # List case: value is list of {id, selected}
-    if isinstance(val, list):
-        for opt in val:
-            if isinstance(opt, dict):
-                selected = opt.get("selected")
-                if selected in (1, True):
-                    if isinstance(opt.get("id"), int):
-                        return opt["id"]
-        # fallback to first id
-        for opt in val:
-            if isinstance(opt, dict) and isinstance(opt.get("id"), int):
-                return opt["id"]
-    return None
+    extract = _SETTING_VALUE_EXTRACTORS.get(type(val))
+    return extract(val) if extract is not None else None
 
 
 def test_device_mutating(base_url: str, token: str, out_dir: str, device_id: int) -> TestOutcome:
@@ -1190,6 +1594,31 @@ def _pick_first_item_id(items_resp: Any) -> Optional[int]:
     return None
 
 
+def _pick_serial_ids(base_url: str, token: str, out_dir: str) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Pick a serial item (for the watchlist/history tests) from the first page of serials.
+    Returns (item_id, season_id); season_id is only set when the listing item already lists its seasons.
+    """
+    resp = _http_request(
+        base_url,
+        "GET",
+        "/v1/items",
+        token=token,
+        query={"type": "serial", "page": 1, "perpage": 5, "sort": "updated-"},
+        retry=True,
+    )
+    _save_snapshot(
+        out_dir,
+        "content_items_serial",
+        {"method": "GET", "path": "/v1/items", "query": {"type": "serial", "page": 1, "perpage": 5}},
+        resp,
+    )
+    serial_item_id = _pick_first_item_id(resp.json)
+    if serial_item_id is None:
+        return None, None
+    return serial_item_id, _pick_ids(resp.json["items"][0])[1]
+
+
 def test_items_listing(base_url: str, token: str, out_dir: str) -> Tuple[TestOutcome, Optional[int]]:
     errors: List[str] = []
     resp = _http_request(
@@ -1198,42 +1627,30 @@ def test_items_listing(base_url: str, token: str, out_dir: str) -> Tuple[TestOut
         "/v1/items",
         token=token,
         query={"type": "movie", "page": 1, "perpage": 5, "sort": "updated-"},
+        retry=True,
     )
     _save_snapshot(
         out_dir,
         "content_items",
-        {
-            "method": "GET",
-            "path": "/v1/items",
-            "query": {"type": "movie", "page": 1, "perpage": 5, "sort": "updated-"},
-            "headers": {"Authorization": "Bearer <token>"},
-        },
+        _SNAP_ITEMS({"type": "movie", "page": 1, "perpage": 5, "sort": "updated-"}),
         resp,
     )
     _require(resp.json is not None, "response is not JSON", errors)
     item_id: Optional[int] = _pick_first_item_id(resp.json)
 
-    if isinstance(resp.json, dict):
-        if "status" in resp.json and resp.json["status"] is not None:
-            _expect_int(resp.json.get("status"), "status", errors)
-        items = resp.json.get("items")
+    obj = _as_dict(resp.json, "root", errors)
+    if obj is not None:
+        if "status" in obj and obj["status"] is not None:
+            _expect_int(obj.get("status"), "status", errors)
+        items = obj.get("items")
         _expect_list(items, "items", errors)
-        if isinstance(items, list) and items:
-            it0 = items[0]
-            _expect_obj(it0, "items[0]", errors)
-            if isinstance(it0, dict):
-                _expect_int(it0.get("id"), "items[0].id", errors)
-                _expect_str(it0.get("title"), "items[0].title", errors)
-                _expect_str(it0.get("type"), "items[0].type", errors)
-        pag = resp.json.get("pagination")
+        if isinstance(items, list):
+            _batch_expect_shape(items[:1], _ITEM_SHAPE, "items", errors)
+        pag = obj.get("pagination")
         if pag is not None:
             _expect_obj(pag, "pagination", errors)
             if isinstance(pag, dict):
-                _expect_int(pag.get("total"), "pagination.total", errors)
-                _expect_int(pag.get("current"), "pagination.current", errors)
-                _expect_int(pag.get("perpage"), "pagination.perpage", errors)
-    else:
-        _expect_obj(resp.json, "root", errors)
+                _expect_fields(pag, _PAGINATION_SHAPE, "pagination", errors)
 
     if item_id is None:
         errors.append("could not pick itemId from /v1/items response")
@@ -1264,85 +1681,86 @@ def test_items_listing_filters(base_url: str, token: str, out_dir: str) -> TestO
         "country": "1",
     }
 
-    resp = _http_request(base_url, "GET", "/v1/items", token=token, query=query)
+    resp = _http_request(base_url, "GET", "/v1/items", token=token, query=query, retry=True)
     _save_snapshot(
         out_dir,
         "content_items_filters",
-        {"method": "GET", "path": "/v1/items", "query": query, "headers": {"Authorization": "Bearer <token>"}},
+        _SNAP_ITEMS(query),
         resp,
     )
 
     _require(resp.status == 200, f"items filters: expected HTTP 200, got {resp.status}", errors)
     _require(resp.json is not None, "items filters: response is not JSON", errors)
-    if isinstance(resp.json, dict):
-        if "status" in resp.json and resp.json["status"] is not None:
-            _expect_int(resp.json.get("status"), "items_filters.status", errors)
-        _expect_list(resp.json.get("items"), "items_filters.items", errors)
-    else:
-        _expect_obj(resp.json, "items_filters.root", errors)
+    obj = _as_dict(resp.json, "items_filters.root", errors)
+    if obj is not None:
+        if "status" in obj and obj["status"] is not None:
+            _expect_int(obj.get("status"), "items_filters.status", errors)
+        _expect_list(obj.get("items"), "items_filters.items", errors)
 
     return TestOutcome(status="PASS" if not errors else "FAIL", errors=errors, context_updates={})
 
 
-def _pick_media_id_from_item(item: Any) -> Optional[int]:
-    # Try videos[].id first, else seasons[].episodes[].id
+def _pick_ids(item: Any) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Return (media_id, season_id) from item details in a single walk.
+    media_id: videos[].id first, else seasons[].episodes[].id; season_id: first seasons[].id.
+    """
     if not isinstance(item, dict):
-        return None
+        return None, None
+    media_id: Optional[int] = None
+    season_id: Optional[int] = None
     videos = item.get("videos")
     if isinstance(videos, list):
         for v in videos:
             if isinstance(v, dict) and isinstance(v.get("id"), int):
-                return v["id"]
+                media_id = v["id"]
+                break
     seasons = item.get("seasons")
     if isinstance(seasons, list):
         for s in seasons:
             if not isinstance(s, dict):
                 continue
-            episodes = s.get("episodes")
-            if isinstance(episodes, list):
-                for e in episodes:
-                    if isinstance(e, dict) and isinstance(e.get("id"), int):
-                        return e["id"]
-    return None
-
-
-def _pick_season_id_from_item(item: Any) -> Optional[int]:
-    if not isinstance(item, dict):
-        return None
-    seasons = item.get("seasons")
-    if isinstance(seasons, list):
-        for s in seasons:
-            if isinstance(s, dict) and isinstance(s.get("id"), int):
-                return s["id"]
-    return None
+            if season_id is None and isinstance(s.get("id"), int):
+                season_id = s["id"]
+            if media_id is None:
+                episodes = s.get("episodes")
+                if isinstance(episodes, list):
+                    for e in episodes:
+                        if isinstance(e, dict) and isinstance(e.get("id"), int):
+                            media_id = e["id"]
+                            break
+            if media_id is not None and season_id is not None:
+                break
+    return media_id, season_id
 
 
 def test_item_details(base_url: str, token: str, out_dir: str, item_id: int) -> Tuple[TestOutcome, Optional[int]]:
     errors: List[str] = []
-    resp = _http_request(base_url, "GET", f"/v1/items/{item_id}", token=token, query={"nolinks": 1})
+    resp = _http_request(base_url, "GET", f"/v1/items/{item_id}", token=token, query={"nolinks": 1}, retry=True)
     _save_snapshot(
         out_dir,
         "content_item_details",
-        {"method": "GET", "path": f"/v1/items/{item_id}", "query": {"nolinks": 1}, "headers": {"Authorization": "Bearer <token>"}},
+        {"method": "GET", "path": f"/v1/items/{item_id}", "query": {"nolinks": 1}, "headers": _AUTH_HDR},
         resp,
     )
     _require(resp.json is not None, "response is not JSON", errors)
     media_id: Optional[int] = None
-    if isinstance(resp.json, dict):
-        item = resp.json.get("item")
+    obj = _as_dict(resp.json, "root", errors)
+    if obj is not None:
+        item = obj.get("item")
         _expect_obj(item, "item", errors)
         if isinstance(item, dict):
-            _expect_int(item.get("id"), "item.id", errors)
-            _expect_str(item.get("title"), "item.title", errors)
-            _expect_str(item.get("type"), "item.type", errors)
+            _expect_fields(item, _ITEM_SHAPE, "item", errors)
             duration = item.get("duration")
             if duration is not None:
                 _expect_obj(duration, "item.duration", errors)
-                if isinstance(duration, dict) and "average" in duration and duration["average"] is not None:
-                    _expect_num(duration.get("average"), "item.duration.average", errors)
-            media_id = _pick_media_id_from_item(item)
-    else:
-        _expect_obj(resp.json, "root", errors)
+                try:
+                    average = duration["average"]
+                except (TypeError, KeyError):
+                    average = None
+                if average is not None:
+                    _expect_num(average, "item.duration.average", errors)
+            media_id = _pick_ids(item)[0]
 
     if media_id is None:
         errors.append("could not pick mediaId from item details (videos/seasons/episodes)")
@@ -1352,17 +1770,18 @@ def test_item_details(base_url: str, token: str, out_dir: str, item_id: int) ->
 
 def test_media_links(base_url: str, token: str, out_dir: str, media_id: int) -> Tuple[TestOutcome, Optional[Tuple[str, str]]]:
     errors: List[str] = []
-    resp = _http_request(base_url, "GET", "/v1/items/media-links", token=token, query={"mid": media_id})
+    resp = _http_request(base_url, "GET", "/v1/items/media-links", token=token, query={"mid": media_id}, retry=True)
     _save_snapshot(
         out_dir,
         "content_media_links",
-        {"method": "GET", "path": "/v1/items/media-links", "query": {"mid": media_id}, "headers": {"Authorization": "Bearer <token>"}},
+        _SNAP_ITEMS_MEDIA_LINKS({"mid": media_id}),
         resp,
     )
     _require(resp.json is not None, "response is not JSON", errors)
     file_and_type: Optional[Tuple[str, str]] = None
-    if isinstance(resp.json, dict):
-        files = resp.json.get("files")
+    obj = _as_dict(resp.json, "root", errors)
+    if obj is not None:
+        files = obj.get("files")
         _expect_list(files, "files", errors)
         if isinstance(files, list) and files:
             f0 = files[0]
@@ -1380,8 +1799,6 @@ def test_media_links(base_url: str, token: str, out_dir: str, media_id: int) ->
                     file_and_type = (f0["file"], chosen_type or "http")
                 else:
                     errors.append("files[0].file missing or not a string")
-    else:
-        _expect_obj(resp.json, "root", errors)
 
     return TestOutcome(status="PASS" if not errors else "FAIL", errors=errors, context_updates={}), file_and_type
 
@@ -1394,18 +1811,18 @@ def test_media_video_link(base_url: str, token: str, out_dir: str, file_path: st
         "/v1/items/media-video-link",
         token=token,
         query={"file": file_path, "type": stream_type},
+        retry=True,
     )
     _save_snapshot(
         out_dir,
         "content_media_video_link",
-        {"method": "GET", "path": "/v1/items/media-video-link", "query": {"file": "<file>", "type": stream_type}, "headers": {"Authorization": "Bearer <token>"}},
+        _SNAP_ITEMS_MEDIA_VIDEO_LINK({"file": "<file>", "type": stream_type}),
         resp,
     )
     _require(resp.json is not None, "response is not JSON", errors)
-    if isinstance(resp.json, dict):
-        _expect_str(resp.json.get("url"), "url", errors)
-    else:
-        _expect_obj(resp.json, "root", errors)
+    obj = _as_dict(resp.json, "root", errors)
+    if obj is not None:
+        _expect_str(obj.get("url"), "url", errors)
     return TestOutcome(status="PASS" if not errors else "FAIL", errors=errors, context_updates={})
 
 
@@ -1426,43 +1843,44 @@ def test_bookmarks_mutating(base_url: str, token: str, out_dir: str, item_id: in
     # create folder
     r_create = _http_request(base_url, "POST", "/v1/bookmarks/create", token=token, form={"title": folder_title})
     _save_snapshot(out_dir, "bookmarks_create_folder", {"method": "POST", "path": "/v1/bookmarks/create", "form": {"title": folder_title}}, r_create)
-    folder_id: Optional[int] = None
-    if isinstance(r_create.json, dict):
-        folder = r_create.json.get("folder")
-        if isinstance(folder, dict) and isinstance(folder.get("id"), int):
-            folder_id = folder["id"]
-    if folder_id is None:
+    try:
+        folder_id: Optional[int] = r_create.json["folder"]["id"]
+    except (TypeError, KeyError):
+        # Not an object, or no folder/id in it.
+        folder_id = None
+    if not isinstance(folder_id, int):
         errors.append("failed to create bookmark folder (no folder.id)")
         return TestOutcome(status="FAIL", errors=errors, context_updates={})
 
-    # list folders again, ensure our folder exists
-    r_list_after = _http_request(base_url, "GET", "/v1/bookmarks", token=token)
+    # list folders again (ensure our folder exists) while adding the item: neither depends on the other
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as ex:
+        f_list_after = ex.submit(_http_request, base_url, "GET", "/v1/bookmarks", token=token)
+        f_add = ex.submit(_http_request, base_url, "POST", "/v1/bookmarks/add", token=token, form={"item": item_id, "folder": folder_id})
+        r_list_after, r_add = f_list_after.result(), f_add.result()
     _save_snapshot(out_dir, "bookmarks_list_after", {"method": "GET", "path": "/v1/bookmarks"}, r_list_after)
-    if isinstance(r_list_after.json, dict) and isinstance(r_list_after.json.get("items"), list):
-        found = False
-        for f in r_list_after.json["items"]:
-            if isinstance(f, dict) and f.get("id") == folder_id:
-                found = True
-                break
-        if not found:
+    try:
+        folders = r_list_after.json["items"]
+    except (TypeError, KeyError):
+        folders = None
+    if isinstance(folders, list):
+        if not any(isinstance(f, dict) and f.get("id") == folder_id for f in folders):
             errors.append("bookmarks list: created folder not found in items[]")
     else:
         errors.append("bookmarks list: unexpected response after create")
 
     # add item
-    r_add = _http_request(base_url, "POST", "/v1/bookmarks/add", token=token, form={"item": item_id, "folder": folder_id})
     _save_snapshot(out_dir, "bookmarks_add_item", {"method": "POST", "path": "/v1/bookmarks/add", "form": {"item": item_id, "folder": folder_id}}, r_add)
     if not isinstance(r_add.json, dict) or (r_add.json.get("status") is None):
         errors.append("bookmark add: unexpected response (expected object with status)")
 
-    # folder items (read endpoint)
-    r_folder_items = _http_request(base_url, "GET", f"/v1/bookmarks/{folder_id}", token=token, query={"page": 1})
+    # folder items + item folders (read endpoints, fetched together once the item is added)
+    r_folder_items, r_item_folders = _get_many(
+        base_url, token, [(f"/v1/bookmarks/{folder_id}", {"page": 1}), ("/v1/bookmarks/get-item-folders", {"item": item_id})]
+    )
     _save_snapshot(out_dir, "bookmarks_folder_items", {"method": "GET", "path": f"/v1/bookmarks/{folder_id}", "query": {"page": 1}}, r_folder_items)
     if not isinstance(r_folder_items.json, dict) or not isinstance(r_folder_items.json.get("items"), list):
         errors.append("bookmarks folder items: unexpected response (expected object with items[])")
 
-    # item folders (read endpoint)
-    r_item_folders = _http_request(base_url, "GET", "/v1/bookmarks/get-item-folders", token=token, query={"item": item_id})
     _save_snapshot(out_dir, "bookmarks_item_folders", {"method": "GET", "path": "/v1/bookmarks/get-item-folders", "query": {"item": item_id}}, r_item_folders)
     if not isinstance(r_item_folders.json, dict) or not isinstance(r_item_folders.json.get("folders"), list):
         errors.append("bookmarks get-item-folders: unexpected response (expected object with folders[])")
@@ -1482,6 +1900,39 @@ def test_bookmarks_mutating(base_url: str, token: str, out_dir: str, item_id: in
     return TestOutcome(status="PASS" if not errors else "FAIL", errors=errors, context_updates={})
 
 
+def _run_dag(jobs: int, tasks: Dict[str, Tuple[Tuple[str, ...], Callable[[Dict[str, Any]], Any]]]) -> Dict[str, Any]:
+    """
+    Run read-only tests given as name -> (dependencies, fn) on up to `jobs` threads; return results by name.
+
+    Each fn is called with the results of the tasks finished so far (its dependencies included) and is
+    started as soon as its dependencies are done. `tasks` must list dependencies before dependents;
+    with jobs <= 1 everything runs serially on the calling thread in that order.
+    """
+    for name, (deps, _fn) in tasks.items():
+        for dep in deps:
+            if dep not in tasks:
+                raise ValueError(f"task {name!r} depends on unknown task {dep!r}")
+    results: Dict[str, Any] = {}
+    if jobs <= 1 or len(tasks) <= 1:
+        for name, (_deps, fn) in tasks.items():
+            results[name] = fn(results)
+        return results
+    pending = dict(tasks)
+    running: Dict[concurrent.futures.Future, str] = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(jobs, len(tasks))) as ex:
+        while pending or running:
+            for name, (deps, fn) in list(pending.items()):
+                if all(dep in results for dep in deps):
+                    del pending[name]
+                    # Tasks get a copy: `results` keeps growing on this thread while they run.
+                    running[ex.submit(fn, dict(results))] = name
+            done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+            for fut in done:
+                results[running.pop(fut)] = fut.result()
+    # Insertion order of `tasks`, so the summary stays deterministic.
+    return {name: results[name] for name in tasks}
+
+
 def _run_all(
     base_url: str,
     token_arg: Optional[str],
@@ -1494,6 +1945,7 @@ def _run_all(
     api2_base_url: Optional[str],
     api2_device_token: Optional[str],
     api2_upload_report: bool,
+    jobs: int = 1,
 ) -> int:
     root_out = os.path.join(_script_dir(), "output", _now_stamp())
     _safe_mkdir(root_out)
@@ -1521,57 +1973,124 @@ def _run_all(
         )
         return 2
 
-    results: List[Tuple[str, str, List[str]]] = []
+    # Connect (one socket per worker) before the first wave of requests needs them.
+    _POOL.prime(base_url, jobs)
+
+    # test_id -> (status, errors), in the order tests are reported; re-adding a test id replaces its entry.
+    results: Dict[str, Tuple[str, List[str]]] = {}
 
     def add(test_id: str, outcome: TestOutcome) -> None:
-        results.append((test_id, outcome.status, outcome.errors))
+        results[test_id] = (outcome.status, outcome.errors)
 
-    # --- Auth + basic ---
+    # --- Read-only tests (run concurrently with --jobs > 1) ---
+    # Each test starts as soon as the tests it takes ids from (item_id, genre_id, collection_id) are done.
+    tasks: Dict[str, Tuple[Tuple[str, ...], Callable[[Dict[str, Any]], Any]]] = {}
     if client_id and client_secret:
-        add("test-auth-oauth2-device-flow", test_oauth_device_flow_pending(base_url, root_out, client_id, client_secret))
+        tasks["oauth"] = ((), lambda r: test_oauth_device_flow_pending(base_url, root_out, client_id, client_secret))
+    tasks.update(
+        {
+            "user": ((), lambda r: test_user(base_url, token, root_out)),
+            "references": ((), lambda r: test_references(base_url, token, root_out)),
+            "tv": ((), lambda r: test_tv(base_url, token, root_out)),
+            "types": ((), lambda r: test_types(base_url, token, root_out)),
+            "genres": ((), lambda r: test_genres(base_url, token, root_out)),
+            "countries": ((), lambda r: test_countries(base_url, token, root_out)),
+            "subtitles": ((), lambda r: test_subtitles(base_url, token, root_out)),
+            "items": ((), lambda r: test_items_listing(base_url, token, root_out)),
+            "items_filters": ((), lambda r: test_items_listing_filters(base_url, token, root_out)),
+            "search": ((), lambda r: test_search(base_url, token, root_out)),
+            "collections": ((), lambda r: test_collections(base_url, token, root_out)),
+            "collections_sort": ((), lambda r: test_collections_sort(base_url, token, root_out)),
+        }
+    )
+
+    def after_items(fn: Callable[[Dict[str, Any], int], Any], *deps: str) -> Tuple[Tuple[str, ...], Callable[[Dict[str, Any]], Any]]:
+        # Tests below only run when the listing produced an item id (without one the run stops early).
+        def run(r: Dict[str, Any]) -> Any:
+            item_id = r["items"][1]
+            return None if item_id is None else fn(r, item_id)
+
+        return ("items",) + deps, run
+
+    def media_chain(r: Dict[str, Any], item_id: int) -> Tuple[TestOutcome, Optional[int], List[Tuple[str, TestOutcome]]]:
+        # item details -> media links -> video link depend on each other: one task runs the whole chain.
+        o_det, media_id = test_item_details(base_url, token, root_out, item_id)
+        media_results: List[Tuple[str, TestOutcome]] = []
+        if media_id is not None:
+            o_links, file_and_type = test_media_links(base_url, token, root_out, media_id)
+            media_results.append(("test-content-media-links", o_links))
+            if file_and_type:
+                fpath, stype = file_and_type
+                media_results.append(("test-content-media-video-link", test_media_video_link(base_url, token, root_out, fpath, stype)))
+        return o_det, media_id, media_results
+
+    tasks["media_chain"] = after_items(media_chain)
+    tasks["similar"] = after_items(lambda r, item_id: test_similar(base_url, token, root_out, item_id))
+    for sc in ["fresh", "hot", "popular"]:
+        tasks[sc] = after_items(lambda r, item_id, sc=sc: test_shortcut(base_url, token, root_out, sc))
+        tasks[f"{sc}-genre"] = after_items(
+            lambda r, item_id, sc=sc: None if r["genres"][1] is None else test_shortcut(base_url, token, root_out, sc, genre=str(r["genres"][1])),
+            "genres",
+        )
+    tasks["trailer"] = after_items(lambda r, item_id: test_trailer(base_url, token, root_out, item_id))
+    tasks["comments"] = after_items(lambda r, item_id: test_comments(base_url, token, root_out, item_id))
+    tasks["collection_items"] = after_items(
+        lambda r, item_id: None if r["collections"][1] is None else test_collection_items(base_url, token, root_out, r["collections"][1]),
+        "collections",
+    )
+    tasks["watching"] = after_items(lambda r, item_id: test_watching(base_url, token, root_out, item_id))
+    if include_mutating or include_destructive:
+        tasks["serial"] = after_items(lambda r, item_id: _pick_serial_ids(base_url, token, root_out))
+    r1 = _run_dag(jobs, tasks)
+
+    # --- Auth + basic ---
+    if "oauth" in r1:
+        add("test-auth-oauth2-device-flow", r1["oauth"])
     else:
         add("test-auth-oauth2-device-flow", TestOutcome(status="SKIP", errors=["client_id/client_secret not available"], context_updates={}))
 
-    add("test-user", test_user(base_url, token, root_out))
+    add("test-user", r1["user"])
 
     # References + TV
-    add("test-references", test_references(base_url, token, root_out))
-    add("test-tv", test_tv(base_url, token, root_out))
+    add("test-references", r1["references"])
+    add("test-tv", r1["tv"])
 
     # Content catalog (arrays)
-    add("test-content-types", test_types(base_url, token, root_out)[0])
-    o_genres, genre_id = test_genres(base_url, token, root_out)
+    add("test-content-types", r1["types"][0])
+    o_genres, genre_id = r1["genres"]
     add("test-content-genres", o_genres)
-    add("test-content-countries", test_countries(base_url, token, root_out))
-    add("test-content-subtitles", test_subtitles(base_url, token, root_out))
+    add("test-content-countries", r1["countries"])
+    add("test-content-subtitles", r1["subtitles"])
 
     # Content listing + details
-    o_items, item_id = test_items_listing(base_url, token, root_out)
+    o_items, item_id = r1["items"]
     add("test-content-items", o_items)
-    add("test-content-items-filters", test_items_listing_filters(base_url, token, root_out))
+    add("test-content-items-filters", r1["items_filters"])
 
     if item_id is None:
         # Can't proceed to media-dependent tests.
-        _write_json(os.path.join(root_out, "summary.json"), {"results": results})
+        _flush_writes()
+        _write_json(os.path.join(root_out, "summary.json"), {"results": _summary_rows(results)})
         _print_summary(results, root_out)
         return 1
 
-    o_det, media_id = test_item_details(base_url, token, root_out, item_id)
+    o_cols, col_id = r1["collections"]
+    o_det, media_id, media_results = r1["media_chain"]
     add("test-content-item-details", o_det)
 
     # Content search/similar/shortcuts
-    add("test-content-search", test_search(base_url, token, root_out))
-    add("test-content-similar", test_similar(base_url, token, root_out, item_id))
+    add("test-content-search", r1["search"])
+    add("test-content-similar", r1["similar"])
     for sc in ["fresh", "hot", "popular"]:
-        add(f"test-content-{sc}", test_shortcut(base_url, token, root_out, sc))
+        add(f"test-content-{sc}", r1[sc])
         if genre_id is not None:
-            add(f"test-content-{sc}-genre", test_shortcut(base_url, token, root_out, sc, genre=str(genre_id)))
+            add(f"test-content-{sc}-genre", r1[f"{sc}-genre"])
         else:
             add(f"test-content-{sc}-genre", TestOutcome(status="SKIP", errors=["could not pick genre_id from /v1/genres"], context_updates={}))
 
     # Trailer/comments/vote (mutating vote)
-    add("test-content-trailer", test_trailer(base_url, token, root_out, item_id))
-    add("test-content-comments", test_comments(base_url, token, root_out, item_id))
+    add("test-content-trailer", r1["trailer"])
+    add("test-content-comments", r1["comments"])
     if include_mutating:
         add("test-content-vote-mutating", test_vote_mutating(base_url, token, root_out, item_id))
     else:
@@ -1580,20 +2099,14 @@ def _run_all(
             TestOutcome(status="SKIP", errors=["mutating tests disabled (enable with --include-mutating)"], context_updates={}),
         )
 
-    if media_id is not None:
-        o_links, file_and_type = test_media_links(base_url, token, root_out, media_id)
-        add("test-content-media-links", o_links)
-        if file_and_type:
-            fpath, stype = file_and_type
-            o_link = test_media_video_link(base_url, token, root_out, fpath, stype)
-            add("test-content-media-video-link", o_link)
+    for test_id, outcome in media_results:
+        add(test_id, outcome)
 
     # Collections
-    o_cols, col_id = test_collections(base_url, token, root_out)
     add("test-collections", o_cols)
-    add("test-collections-sort", test_collections_sort(base_url, token, root_out))
+    add("test-collections-sort", r1["collections_sort"])
     if col_id is not None:
-        add("test-collections-view", test_collection_items(base_url, token, root_out, col_id))
+        add("test-collections-view", r1["collection_items"])
 
     # Bookmarks: mutating create/add/remove cleanup
     if include_mutating:
@@ -1605,7 +2118,7 @@ def _run_all(
         )
 
     # Watching (read + mutating)
-    add("test-watching", test_watching(base_url, token, root_out, item_id)[0])
+    add("test-watching", r1["watching"][0])
     if include_mutating:
         if media_id is not None:
             add("test-watching-mutating", test_watching_mutating(base_url, token, root_out, item_id, media_id))
@@ -1620,24 +2133,8 @@ def _run_all(
             TestOutcome(status="SKIP", errors=["mutating tests disabled (enable with --include-mutating)"], context_updates={}),
         )
 
-    # Pick a serial item for watchlist toggles / season id (for destructive history tests).
-    season_id: Optional[int] = None
-    serial_item_id: Optional[int] = None
-    if include_mutating or include_destructive:
-        serial_resp = _http_request(
-            base_url,
-            "GET",
-            "/v1/items",
-            token=token,
-            query={"type": "serial", "page": 1, "perpage": 5, "sort": "updated-"},
-        )
-        _save_snapshot(
-            root_out,
-            "content_items_serial",
-            {"method": "GET", "path": "/v1/items", "query": {"type": "serial", "page": 1, "perpage": 5}},
-            serial_resp,
-        )
-        serial_item_id = _pick_first_item_id(serial_resp.json)
+    # Serial item for watchlist toggles / season id (for destructive history tests), picked with the reads.
+    serial_item_id, season_id = r1.get("serial", (None, None))
 
     if include_mutating:
         if serial_item_id is not None:
@@ -1653,11 +2150,12 @@ def _run_all(
             TestOutcome(status="SKIP", errors=["mutating tests disabled (enable with --include-mutating)"], context_updates={}),
         )
 
-    if include_destructive and serial_item_id is not None:
+    if include_destructive and serial_item_id is not None and season_id is None:
+        # The listing had no seasons for this serial: fetch its details for one.
         serial_det = _http_request(base_url, "GET", f"/v1/items/{serial_item_id}", token=token, query={"nolinks": 1})
         _save_snapshot(root_out, "serial_item_details", {"method": "GET", "path": f"/v1/items/{serial_item_id}", "query": {"nolinks": 1}}, serial_det)
         if isinstance(serial_det.json, dict):
-            season_id = _pick_season_id_from_item(serial_det.json.get("item"))
+            season_id = _pick_ids(serial_det.json.get("item"))[1]
 
     # History (read + destructive clears)
     o_hist, picked = test_history(base_url, token, root_out)
@@ -1732,18 +2230,24 @@ def _run_all(
     else:
         add("test-api2", TestOutcome(status="SKIP", errors=["api2 tests not enabled (use --include-api2)"], context_updates={}))
 
-    _write_json(os.path.join(root_out, "summary.json"), {"results": results})
+    _flush_writes()
+    _write_json(os.path.join(root_out, "summary.json"), {"results": _summary_rows(results)})
     _print_summary(results, root_out)
     # Treat SKIP as non-failing; only FAIL should produce a failing exit code.
-    return 0 if all(s != "FAIL" for _, s, _ in results) else 1
+    return 0 if all(s != "FAIL" for s, _ in results.values()) else 1
+
 
+def _summary_rows(results: Dict[str, Tuple[str, List[str]]]) -> List[Tuple[str, str, List[str]]]:
+    # summary.json keeps its list of [test_id, status, errors] rows.
+    return [(test_id, status, errs) for test_id, (status, errs) in results.items()]
 
-def _print_summary(results: List[Tuple[str, str, List[str]]], out_dir: str) -> None:
+
+def _print_summary(results: Dict[str, Tuple[str, List[str]]], out_dir: str) -> None:
     print("")
     print("KinoPub API test summary")
     print(f"- Output: {out_dir}")
     print("")
-    for test_id, status, errs in results:
+    for test_id, (status, errs) in results.items():
         print(f"{status:4} {test_id}")
         for e in errs[:10]:
             print(f"  - {e}")
@@ -1751,7 +2255,8 @@ def _print_summary(results: List[Tuple[str, str, List[str]]], out_dir: str) -> N
             print(f"  - ... {len(errs) - 10} more")
 
 
-def main() -> int:
+def _build_parser() -> argparse.ArgumentParser:
+    # Built per call: the env-var defaults must reflect the environment at parse time.
     ap = argparse.ArgumentParser()
     ap.add_argument("--base-url", default=BASE_URL_DEFAULT)
     ap.add_argument("--token", default=None, help="Access token for Authorization: Bearer <token> (overrides env/file)")
@@ -1764,7 +2269,12 @@ def main() -> int:
     ap.add_argument("--api2-base-url", default=None, help="Base URL for api2 endpoints (default: derived from --base-url)")
     ap.add_argument("--api2-device-token", default=os.environ.get("KINOPUB_API2_DEVICE_TOKEN"), help="Device token for api2 notifications endpoints (optional)")
     ap.add_argument("--api2-upload-report", action="store_true", help="Enable api2 upload_report POST test (mutating; requires --include-mutating)")
-    args = ap.parse_args()
+    ap.add_argument("--jobs", type=int, default=4, help="Run independent read-only tests on this many threads (1 = serial)")
+    return ap
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _build_parser().parse_args(argv)
 
     return _run_all(
         base_url=args.base_url,
@@ -1778,6 +2288,7 @@ def main() -> int:
         api2_base_url=args.api2_base_url,
         api2_device_token=args.api2_device_token,
         api2_upload_report=args.api2_upload_report,
+        jobs=args.jobs,
     )
 
 